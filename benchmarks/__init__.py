@@ -0,0 +1 @@
+"""Benchmarks for the Easy PV integration."""
@@ -0,0 +1,135 @@
+"""Shared helpers for the Easy PV benchmarks."""
+
+import json
+import statistics
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.easy_pv.const import DOMAIN
+
+from .mock_cloud import TOKEN
+
+
+@dataclass
+class Result:
+    """Measurements of a benchmark."""
+
+    name: str
+    runs: int
+    wall_mean: float
+    wall_min: float
+    wall_max: float
+    count: float
+    count_name: str
+    peak_memory: int
+    allocations: int
+    errors: float = 0.0
+
+    def format(self) -> str:
+        """Format the result as a single line."""
+        return (
+            f"{self.name:<40} "
+            f"mean {self.wall_mean * 1000:9.2f} ms  "
+            f"min {self.wall_min * 1000:9.2f} ms  "
+            f"max {self.wall_max * 1000:9.2f} ms  "
+            f"{self.count_name} {self.count:8.1f}  "
+            f"errors {self.errors:6.1f}  "
+            f"peak {self.peak_memory / 1024:9.1f} KiB  "
+            f"allocations {self.allocations:8d}"
+        )
+
+
+async def async_measure(  # noqa: PLR0913
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    runs: int,
+    count: Callable[[], int] = lambda: 0,
+    count_name: str = "requests",
+    errors: Callable[[], int] = lambda: 0,
+) -> Result:
+    """
+    Measure an async function.
+
+    Wall times are taken from `runs` untraced calls. Peak memory and the number
+    of allocated memory blocks still alive afterwards are taken from one extra
+    call with tracemalloc enabled. `count` is sampled around the untraced calls
+    and reported per call, e.g. the number of requests sent. `errors` is
+    reported the same way, e.g. the failed requests that were retried.
+    """
+    wall_times: list[float] = []
+    count_before = count()
+    errors_before = errors()
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        wall_times.append(time.perf_counter() - start)
+    count_per_run = (count() - count_before) / max(runs, 1)
+    errors_per_run = (errors() - errors_before) / max(runs, 1)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    await func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocations = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "lineno")
+        if stat.count_diff > 0
+    )
+
+    return Result(
+        name=name,
+        runs=runs,
+        wall_mean=statistics.fmean(wall_times) if wall_times else 0.0,
+        wall_min=min(wall_times, default=0.0),
+        wall_max=max(wall_times, default=0.0),
+        count=count_per_run,
+        count_name=count_name,
+        peak_memory=peak,
+        allocations=allocations,
+        errors=errors_per_run,
+    )
+
+
+def print_results(results: list[Result], *, as_json: bool = False) -> None:
+    """Print benchmark results as text or JSON."""
+    if as_json:
+        print(json.dumps([asdict(result) for result in results], indent=2))  # noqa: T201
+        return
+
+    for result in results:
+        print(result.format())  # noqa: T201
+
+
+@asynccontextmanager
+async def async_bench_hass() -> AsyncIterator[HomeAssistant]:
+    """Run a minimal in-process Home Assistant instance."""
+    async with async_test_home_assistant() as hass:
+        yield hass
+
+
+def add_config_entry(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Add an Easy PV config entry for the mock cloud."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="benchmark",
+        data={"token": TOKEN, "email": "benchmark@example.com"},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    return entry
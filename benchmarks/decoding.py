@@ -0,0 +1,232 @@
+"""
+Response decoding micro-benchmarks.
+
+Compares decoding raw getDeviceDataInfo and getStationList responses with the
+schema based decoders of the integration against plain `json.loads` followed by
+indexing the resulting dicts field by field.
+
+Run with `python -m benchmarks.decoding --help`.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from typing import Any
+
+from custom_components.easy_pv.decoding import decode_device, decode_station
+from custom_components.easy_pv.easy_pv import json_loads
+from custom_components.easy_pv.model import (
+    PVDevice,
+    PVDeviceInfo,
+    PVPanel,
+    PVStationTopology,
+    device_key,
+    panel_key,
+)
+
+from .common import Result, async_measure, print_results
+
+
+def _response(data: Any) -> bytes:
+    return json.dumps({"code": 200, "msg": "ok", "data": data}).encode()
+
+
+def make_device_payloads(devices: int, panels: int, seed: int = 0) -> list[bytes]:
+    """Create raw device data responses like the mock cloud sends them."""
+    values = random.Random(seed)  # noqa: S311
+    payloads: list[bytes] = []
+    for idx in range(devices):
+        device_panels = [
+            {
+                "sort": panel + 1,
+                "genPower": round(values.uniform(0, 400), 1),
+                "current": round(values.uniform(0, 12), 2),
+                "voltage": round(values.uniform(28, 40), 1),
+            }
+            for panel in range(panels)
+        ]
+        payloads.append(
+            _response(
+                {
+                    "productCode": "VN2T08EU",
+                    "deviceNum": f"inverter{idx}",
+                    "appFirmVer": "1.0.0",
+                    "netFirmVer": "1.0.0",
+                    "genPower": round(
+                        sum(panel["genPower"] for panel in device_panels), 1
+                    ),
+                    "genpowerMonthTotals": round(values.uniform(0, 300), 2),
+                    "genpowerTodayTotals": round(values.uniform(0, 10), 2),
+                    "gridVoltage": round(values.uniform(225, 235), 1),
+                    "devicePhotovoltaicPanel": device_panels,
+                }
+            )
+        )
+
+    return payloads
+
+
+def make_station_list(stations: int) -> bytes:
+    """Create a raw station list response like the mock cloud sends it."""
+    return _response(
+        {
+            "rows": [
+                {
+                    "id": f"station{idx}",
+                    "name": f"Station {idx}",
+                    "address": f"Street {idx}",
+                    "plantLocation": "Benchmark",
+                    "latitude": 48.0 + idx * 0.01,
+                    "longitude": 11.0 + idx * 0.01,
+                    "genPower": 0.0,
+                    "todayPowerTotals": 0.0,
+                    "powerTotals": 1000.0 + idx,
+                }
+                for idx in range(stations)
+            ],
+            "total": stations,
+        }
+    )
+
+
+def _dict_device(station_id: str, device_id: str, payload: bytes) -> PVDevice:
+    """Decode a device by indexing the dicts of `json.loads`, the reference path."""
+    data = json.loads(payload)["data"]
+    info = PVDeviceInfo(
+        product_code=data["productCode"],
+        device_serial=data["deviceNum"],
+        app_fw=data["appFirmVer"],
+        net_fw=data["netFirmVer"],
+    )
+    return PVDevice(
+        entity_id=device_key(station_id, device_id),
+        entity_name=info.product_code,
+        id=device_id,
+        station_id=station_id,
+        power=data["genPower"],
+        energy_month=data["genpowerMonthTotals"],
+        energy_today=data["genpowerTodayTotals"],
+        grid_voltage=data["gridVoltage"],
+        info=info,
+        panels=tuple(
+            PVPanel(
+                entity_id=panel_key(station_id, device_id, int(panel["sort"]) - 1),
+                entity_name=f"{info.product_code} Panel {panel['sort']}",
+                idx=int(panel["sort"]) - 1,
+                station_id=station_id,
+                device_id=device_id,
+                power=panel["genPower"],
+                current=panel["current"],
+                voltage=panel["voltage"],
+            )
+            for panel in data.get("devicePhotovoltaicPanel", [])
+        ),
+    )
+
+
+def _dict_stations(payload: bytes) -> list[PVStationTopology]:
+    """Decode a station list by indexing the dicts of `json.loads`."""
+    return [
+        PVStationTopology(
+            id=station["id"],
+            name=station["name"],
+            address=station["address"],
+            location=station["plantLocation"],
+            latitude=station["latitude"],
+            longitude=station["longitude"],
+            energy_total=station["powerTotals"],
+            energy_today=station["todayPowerTotals"],
+            device_ids=(),
+        )
+        for station in json.loads(payload)["data"]["rows"]
+    ]
+
+
+async def _run(args: argparse.Namespace) -> list[Result]:
+    payloads = make_device_payloads(args.devices, args.panels)
+    station_list = make_station_list(args.stations)
+    backend = json_loads.__module__
+    decoded = 0
+
+    def count() -> int:
+        return decoded
+
+    async def dict_devices() -> None:
+        nonlocal decoded
+        for idx, payload in enumerate(payloads):
+            _dict_device("station", f"inverter{idx}", payload)
+        decoded += len(payloads)
+
+    async def schema_devices() -> None:
+        nonlocal decoded
+        for idx, payload in enumerate(payloads):
+            decode_device("station", f"inverter{idx}", payload)
+        decoded += len(payloads)
+
+    previous = [
+        decode_device("station", f"inverter{idx}", payload)
+        for idx, payload in enumerate(payloads)
+    ]
+
+    async def schema_devices_unchanged() -> None:
+        nonlocal decoded
+        for idx, payload in enumerate(payloads):
+            decode_device("station", f"inverter{idx}", payload, previous[idx])
+        decoded += len(payloads)
+
+    async def dict_stations() -> None:
+        nonlocal decoded
+        decoded += len(_dict_stations(station_list))
+
+    async def schema_stations() -> None:
+        nonlocal decoded
+        rows = json_loads(station_list)["data"]["rows"]
+        decoded += len([decode_station(row) for row in rows])
+
+    return [
+        await async_measure(
+            "devices: json + dicts", dict_devices, args.runs, count, "decoded"
+        ),
+        await async_measure(
+            f"devices: schema ({backend})",
+            schema_devices,
+            args.runs,
+            count,
+            "decoded",
+        ),
+        await async_measure(
+            f"devices: schema unchanged ({backend})",
+            schema_devices_unchanged,
+            args.runs,
+            count,
+            "decoded",
+        ),
+        await async_measure(
+            "stations: json + dicts", dict_stations, args.runs, count, "decoded"
+        ),
+        await async_measure(
+            f"stations: schema ({backend})",
+            schema_stations,
+            args.runs,
+            count,
+            "decoded",
+        ),
+    ]
+
+
+def main() -> None:
+    """Run the decoding benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=1000)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--panels", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    print_results(asyncio.run(_run(args)), as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Entity layer scaling benchmarks.
+
+Builds synthetic coordinators with large fleets and measures entity creation,
+adding the entities to Home Assistant, the per update cost of the topology
+listeners of setup_platform_entry and the fan-out of coordinator updates to the
+entities.
+
+Run with `python -m benchmarks.entities --help`.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.easy_pv import device_tracker, sensor
+from custom_components.easy_pv.const import DOMAIN
+from custom_components.easy_pv.coordinator import EasyPVCoordinator
+from custom_components.easy_pv.easy_pv import EasyPVClient
+from custom_components.easy_pv.model import (
+    PVDevice,
+    PVDeviceInfo,
+    PVPanel,
+    PVStation,
+    device_key,
+    panel_key,
+)
+
+from .common import (
+    Result,
+    add_config_entry,
+    async_bench_hass,
+    async_measure,
+    print_results,
+)
+from .mock_cloud import TOKEN
+
+LOGGER = logging.getLogger(__name__)
+
+
+def make_fleet(
+    prefix: str, stations: int, inverters: int, panels: int, revision: int = 0
+) -> dict[str, PVStation]:
+    """Create synthetic station data."""
+    fleet: dict[str, PVStation] = {}
+    for station_idx in range(stations):
+        station_id = f"{prefix}station{station_idx}"
+        devices: dict[str, PVDevice] = {}
+        for inverter_idx in range(inverters):
+            device_id = f"inverter{inverter_idx}"
+            info = PVDeviceInfo(
+                product_code="VN2T08EU",
+                device_serial=f"{station_id}-{device_id}",
+                app_fw="1.0.0",
+                net_fw="1.0.0",
+            )
+            devices[device_id] = PVDevice(
+                entity_id=device_key(station_id, device_id),
+                entity_name=info.product_code,
+                id=device_id,
+                station_id=station_id,
+                power=100.0 * panels + revision,
+                energy_month=100.0 + revision,
+                energy_today=1.0 + revision,
+                grid_voltage=230.0 + revision,
+                info=info,
+                panels=tuple(
+                    PVPanel(
+                        entity_id=panel_key(station_id, device_id, idx),
+                        entity_name=f"{info.product_code} Panel {idx + 1}",
+                        idx=idx,
+                        station_id=station_id,
+                        device_id=device_id,
+                        power=100.0 + revision,
+                        current=3.0 + revision,
+                        voltage=33.0 + revision,
+                    )
+                    for idx in range(panels)
+                ),
+            )
+
+        fleet[station_id] = PVStation(
+            entity_id=station_id,
+            entity_name=f"Station {station_idx}",
+            id=station_id,
+            name=f"Station {station_idx}",
+            address=f"Street {station_idx}",
+            location="Benchmark",
+            latitude=48.0 + revision / 1000,
+            longitude=11.0 + revision / 1000,
+            power=sum(device.power for device in devices.values()),
+            energy_total=1000.0 + revision,
+            energy_today=sum(device.energy_today for device in devices.values()),
+            devices=devices,
+        )
+
+    return fleet
+
+
+def _set_fleet(coordinator: EasyPVCoordinator, fleet: dict[str, PVStation]) -> None:
+    """Set the data of a coordinator as if all of it was just refreshed."""
+    now = dt_util.utcnow()
+    coordinator._refreshed = {  # noqa: SLF001
+        key: now
+        for station in fleet.values()
+        for key in (
+            station.entity_id,
+            *(device.entity_id for device in station.devices.values()),
+        )
+    }
+    coordinator.async_set_updated_data(fleet)
+
+
+def _coordinator(
+    hass: HomeAssistant, entry: MockConfigEntry, fleet: dict[str, PVStation]
+) -> EasyPVCoordinator:
+    # Entities are only available while the client is logged in.
+    client = EasyPVClient()
+    client.use_token(TOKEN)
+    coordinator = EasyPVCoordinator(hass, entry, client)
+    _set_fleet(coordinator, fleet)
+    entry.runtime_data = coordinator
+    return coordinator
+
+
+async def _create_entities(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> dict[Platform, list[Entity]]:
+    """Run the platform setup of the integration and collect the entities."""
+    entities: dict[Platform, list[Entity]] = {}
+    for platform, module in (
+        (Platform.SENSOR, sensor),
+        (Platform.DEVICE_TRACKER, device_tracker),
+    ):
+        collected = entities.setdefault(platform, [])
+        await module.async_setup_entry(
+            hass,
+            entry,
+            lambda new_entities, *_, collected=collected: collected.extend(
+                new_entities
+            ),
+        )
+
+    return entities
+
+
+async def _add_entities(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    entities: dict[Platform, list[Entity]],
+) -> None:
+    """Add entities to Home Assistant through real entity platforms."""
+    for domain, platform_entities in entities.items():
+        platform = EntityPlatform(
+            hass=hass,
+            logger=LOGGER,
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=60),
+            entity_namespace=None,
+        )
+        platform.config_entry = entry
+        await platform.async_add_entities(platform_entities)
+
+
+async def _run(args: argparse.Namespace) -> list[Result]:
+    results: list[Result] = []
+    fleet_size = (args.stations, args.inverters, args.panels)
+
+    async with async_bench_hass() as hass:
+        entry = add_config_entry(hass)
+        state_changes = 0
+
+        @callback
+        def _count_state_change(_: Event[Any]) -> None:
+            nonlocal state_changes
+            state_changes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_change)
+
+        created = 0
+        _coordinator(hass, entry, make_fleet("create", *fleet_size))
+
+        async def create() -> None:
+            nonlocal created
+            entities = await _create_entities(hass, entry)
+            created += sum(len(platform) for platform in entities.values())
+
+        results.append(
+            await async_measure(
+                "setup_platform_entry: create entities",
+                create,
+                args.runs,
+                lambda: created,
+                "entities",
+            )
+        )
+
+        run = 0
+        added = 0
+
+        async def add() -> None:
+            nonlocal run, added
+            run += 1
+            _coordinator(hass, entry, make_fleet(f"add{run}", *fleet_size))
+            entities = await _create_entities(hass, entry)
+            await _add_entities(hass, entry, entities)
+            added += sum(len(platform) for platform in entities.values())
+
+        results.append(
+            await async_measure(
+                "platform: create and add entities",
+                add,
+                args.runs,
+                lambda: added,
+                "entities",
+            )
+        )
+
+        # Only the topology listeners of setup_platform_entry are registered here.
+        check_coordinator = _coordinator(hass, entry, make_fleet("check", *fleet_size))
+        await _create_entities(hass, entry)
+
+        async def check_device() -> None:
+            check_coordinator.async_update_listeners()
+
+        results.append(
+            await async_measure(
+                "topology listeners: unchanged topology",
+                check_device,
+                args.runs,
+                lambda: state_changes,
+                "state changes",
+            )
+        )
+
+        # Entities are added, so every update also fans out to all of them.
+        fleets = [make_fleet("fanout", *fleet_size, revision) for revision in (0, 1)]
+        fanout_coordinator = _coordinator(hass, entry, fleets[0])
+        fanout_entities = await _create_entities(hass, entry)
+        await _add_entities(hass, entry, fanout_entities)
+        # Entities disabled by default are not added, the breaker state does not
+        # depend on the data, all other entities change with every revision.
+        changing = sum(
+            1
+            for platform in fanout_entities.values()
+            for entity in platform
+            if entity.entity_id is not None
+            and hass.states.get(entity.entity_id) is not None
+            and not isinstance(entity, sensor.DeviceBreakerStateSensor)
+        )
+        revision = 0
+
+        async def fanout_unchanged() -> None:
+            fanout_coordinator.async_update_listeners()
+
+        async def fanout_changed() -> None:
+            nonlocal revision
+            revision ^= 1
+            _set_fleet(fanout_coordinator, fleets[revision])
+
+        results.append(
+            await async_measure(
+                "fan-out: unchanged data",
+                fanout_unchanged,
+                args.runs,
+                lambda: state_changes,
+                "state changes",
+            )
+        )
+        changed = await async_measure(
+            "fan-out: all values changed",
+            fanout_changed,
+            args.runs,
+            lambda: state_changes,
+            "state changes",
+        )
+        if changed.count != changing:
+            LOGGER.warning(
+                "Expected %d state changes per update, got %.1f",
+                changing,
+                changed.count,
+            )
+        results.append(changed)
+
+    return results
+
+
+def main() -> None:
+    """Run the entity layer benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=10)
+    parser.add_argument("--inverters", type=int, default=250)
+    parser.add_argument("--panels", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    print_results(asyncio.run(_run(args)), as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
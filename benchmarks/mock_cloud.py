@@ -0,0 +1,236 @@
+"""
+Local stand-in for the Easy PV cloud API.
+
+Serves a synthetic fleet of N stations x M inverters x K panels with configurable
+latency, jitter and error rate and counts the requests per endpoint.
+
+Run it standalone with `python -m benchmarks.mock_cloud --help`.
+"""
+
+import argparse
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+TOKEN = "mock-token"  # noqa: S105
+
+ENDPOINT_LOGIN = "/api/sys/v2/passLogin"
+ENDPOINT_USER_INFO = "/api/user/v2/selectUserInfo"
+ENDPOINT_STATIONS = "/api/powerStation/v3/getStationList"
+ENDPOINT_DEVICES = "/api/powerStation/v2/getPowerList"
+ENDPOINT_DEVICE_DATA = "/api/powerStation/v3/getDeviceDataInfo"
+
+
+@dataclass
+class MockCloudConfig:
+    """Settings of the mock cloud."""
+
+    stations: int = 1
+    inverters: int = 4
+    panels: int = 4
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    change_rate: float = 1.0
+    seed: int = 0
+
+
+@dataclass
+class MockCloud:
+    """Mock Easy PV cloud serving a synthetic fleet."""
+
+    config: MockCloudConfig = field(default_factory=MockCloudConfig)
+    requests: Counter[str] = field(default_factory=Counter)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        """Initialize the random state and the HTTP application."""
+        self._random = random.Random(self.config.seed)  # noqa: S311
+        self._revisions: dict[str, int] = {}
+        self._runner: web.AppRunner | None = None
+        self.app = web.Application()
+        self.app.router.add_post(ENDPOINT_LOGIN, self._login)
+        self.app.router.add_get(ENDPOINT_USER_INFO, self._user_info)
+        self.app.router.add_get(ENDPOINT_STATIONS, self._stations)
+        self.app.router.add_get(ENDPOINT_DEVICES, self._devices)
+        self.app.router.add_get(ENDPOINT_DEVICE_DATA, self._device_data)
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    @property
+    def total_errors(self) -> int:
+        """Return the number of requests answered with a server error."""
+        return sum(self.errors.values())
+
+    def reset_counters(self) -> None:
+        """Reset the request counters."""
+        self.requests.clear()
+        self.errors.clear()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _respond(self, request: web.Request, data: Any) -> web.Response:
+        self.requests[request.path] += 1
+
+        delay = self.config.latency + self._random.uniform(
+            -self.config.jitter, self.config.jitter
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.config.error_rate:
+            self.errors[request.path] += 1
+            return web.Response(status=500, text="Internal Server Error")
+
+        if request.path != ENDPOINT_LOGIN and (
+            request.headers.get("Authorization") != f"Bearer {TOKEN}"
+        ):
+            return web.json_response({"code": 401, "msg": "Unauthorized"})
+
+        return web.json_response({"code": 200, "msg": "ok", "data": data})
+
+    async def _login(self, request: web.Request) -> web.Response:
+        return await self._respond(request, {"token": TOKEN})
+
+    async def _user_info(self, request: web.Request) -> web.Response:
+        return await self._respond(
+            request, {"userName": "benchmark", "email": "benchmark@example.com"}
+        )
+
+    async def _stations(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("pageNum", 1))
+        size = int(request.query.get("pageSize", 10))
+        first = (page - 1) * size
+        rows = [
+            {
+                "id": f"station{idx}",
+                "name": f"Station {idx}",
+                "address": f"Street {idx}",
+                "plantLocation": "Benchmark",
+                "latitude": 48.0 + idx * 0.01,
+                "longitude": 11.0 + idx * 0.01,
+                "genPower": 0.0,
+                "todayPowerTotals": 0.0,
+                "powerTotals": 1000.0 + idx,
+            }
+            for idx in range(first, min(first + size, self.config.stations))
+        ]
+        return await self._respond(
+            request, {"rows": rows, "total": self.config.stations}
+        )
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        station_id = request.query["powerId"]
+        return await self._respond(
+            request,
+            [
+                {"id": f"{station_id}-inverter{idx}"}
+                for idx in range(self.config.inverters)
+            ],
+        )
+
+    async def _device_data(self, request: web.Request) -> web.Response:
+        device_id = request.query["deviceId"]
+        revision = self._revisions.get(device_id, 0)
+        if self._random.random() < self.config.change_rate:
+            revision += 1
+        self._revisions[device_id] = revision
+
+        values = random.Random(f"{device_id}:{revision}")  # noqa: S311
+        panels = [
+            {
+                "sort": idx + 1,
+                "genPower": round(values.uniform(0, 400), 1),
+                "current": round(values.uniform(0, 12), 2),
+                "voltage": round(values.uniform(28, 40), 1),
+            }
+            for idx in range(self.config.panels)
+        ]
+        return await self._respond(
+            request,
+            {
+                "productCode": "VN2T08EU",
+                "deviceNum": device_id,
+                "appFirmVer": "1.0.0",
+                "netFirmVer": "1.0.0",
+                "genPower": round(sum(panel["genPower"] for panel in panels), 1),
+                "genpowerMonthTotals": round(values.uniform(0, 300), 2),
+                "genpowerTodayTotals": round(values.uniform(0, 10), 2),
+                "gridVoltage": round(values.uniform(225, 235), 1),
+                "devicePhotovoltaicPanel": panels,
+            },
+        )
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock cloud settings to an argument parser."""
+    parser.add_argument("--stations", type=int, default=1)
+    parser.add_argument("--inverters", type=int, default=4)
+    parser.add_argument("--panels", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--change-rate",
+        type=float,
+        default=1.0,
+        help="probability that a device reports new values on a request",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_arguments(args: argparse.Namespace) -> MockCloudConfig:
+    """Create the mock cloud settings from parsed arguments."""
+    return MockCloudConfig(
+        stations=args.stations,
+        inverters=args.inverters,
+        panels=args.panels,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        change_rate=args.change_rate,
+        seed=args.seed,
+    )
+
+
+async def _serve(config: MockCloudConfig, port: int) -> None:
+    cloud = MockCloud(config)
+    base_url = await cloud.start(port=port)
+    print(f"Mock Easy PV cloud listening on {base_url}")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    """Run the mock cloud standalone."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_config_arguments(parser)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    asyncio.run(_serve(config_from_arguments(args), args.port))
+
+
+if __name__ == "__main__":
+    main()
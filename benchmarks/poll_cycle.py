@@ -0,0 +1,126 @@
+"""
+End-to-end poll cycle benchmarks against the mock cloud.
+
+Measures a full crawl with EasyPVClient as well as cold and warm refreshes of
+EasyPVCoordinator and reports wall time, requests, server errors (which the
+client retries), peak memory and allocations. The client rate limit is disabled
+unless `--rate-limit` is given, so the wall time measures the code.
+
+Run with `python -m benchmarks.poll_cycle --help`.
+"""
+
+import argparse
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.easy_pv.coordinator import EasyPVCoordinator
+from custom_components.easy_pv.easy_pv import EasyPVClient
+
+from .common import (
+    Result,
+    add_config_entry,
+    async_bench_hass,
+    async_measure,
+    print_results,
+)
+from .mock_cloud import TOKEN, MockCloud, add_config_arguments, config_from_arguments
+
+
+async def _bench_client(
+    cloud: MockCloud, base_url: str, runs: int, rate_limit: float | None
+) -> Result:
+    async with EasyPVClient(base_url=base_url, rate_limit=rate_limit) as client:
+        await client.login_with_token(TOKEN)
+
+        async def crawl() -> None:
+            for station in await client.get_stations():
+                for device in await client.get_station_devices(station["id"]):
+                    await client.get_device_data(station["id"], device["id"])
+
+        return await async_measure(
+            "client: sequential crawl",
+            crawl,
+            runs,
+            lambda: cloud.total_requests,
+            errors=lambda: cloud.total_errors,
+        )
+
+
+async def _bench_coordinator(
+    hass: HomeAssistant,
+    cloud: MockCloud,
+    base_url: str,
+    runs: int,
+    rate_limit: float | None,
+) -> list[Result]:
+    entry = add_config_entry(hass)
+
+    async def cold_refresh() -> None:
+        async with EasyPVClient(base_url=base_url, rate_limit=rate_limit) as client:
+            coordinator = EasyPVCoordinator(hass, entry, client)
+            await coordinator._async_update_data()  # noqa: SLF001
+
+    async with EasyPVClient(base_url=base_url, rate_limit=rate_limit) as client:
+        coordinator = EasyPVCoordinator(hass, entry, client)
+        coordinator.async_set_updated_data(
+            await coordinator._async_update_data()  # noqa: SLF001
+        )
+
+        async def warm_refresh() -> None:
+            coordinator.async_set_updated_data(
+                await coordinator._async_update_data()  # noqa: SLF001
+            )
+
+        return [
+            await async_measure(
+                "coordinator: cold refresh",
+                cold_refresh,
+                runs,
+                lambda: cloud.total_requests,
+                errors=lambda: cloud.total_errors,
+            ),
+            await async_measure(
+                "coordinator: warm refresh",
+                warm_refresh,
+                runs,
+                lambda: cloud.total_requests,
+                errors=lambda: cloud.total_errors,
+            ),
+        ]
+
+
+async def _run(args: argparse.Namespace) -> list[Result]:
+    cloud = MockCloud(config_from_arguments(args))
+    base_url = await cloud.start()
+    try:
+        results = [await _bench_client(cloud, base_url, args.runs, args.rate_limit)]
+        async with async_bench_hass() as hass:
+            results += await _bench_coordinator(
+                hass, cloud, base_url, args.runs, args.rate_limit
+            )
+    finally:
+        await cloud.stop()
+
+    return results
+
+
+def main() -> None:
+    """Run the poll cycle benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_config_arguments(parser)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="requests per second of the client rate limit, disabled by default",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    print_results(asyncio.run(_run(args)), as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,64 @@ import logging
 from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import config_validation as cv
 
-from .const import PLATFORMS
-from .coordinator import EasyPVCoordinator
+from .backfill import BackfillStore
+from .const import DOMAIN, PLATFORMS
+from .coordinator import EasyPVCoordinator, month_cache_directory
+from .easy_pv import MonthCache
+from .services import async_setup_services
+from .snapshot import SnapshotStore
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 type EasyPVConfigEntry = ConfigEntry[EasyPVCoordinator]
 
 LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, _: ConfigType) -> bool:
+    """Set up the EasyPV integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: EasyPVConfigEntry) -> bool:
     """Set up EasyPV from a config entry."""
-    entry.runtime_data = EasyPVCoordinator(hass, entry)
+    coordinator = EasyPVCoordinator(hass, entry)
+    entry.runtime_data = coordinator
+
+    # With a stored snapshot the entities are created right away and the live
+    # data is filled in by a background refresh.
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
-    await entry.runtime_data.async_config_entry_first_refresh()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: EasyPVConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: EasyPVConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: EasyPVConfigEntry) -> None:
+    """Remove the stored snapshot, backfill checkpoints and month cache."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+    await BackfillStore(hass, entry.entry_id).async_remove()
+    await MonthCache(month_cache_directory(hass, entry.entry_id)).clear()
@@ -0,0 +1,168 @@
+"""Backfill of long-term energy statistics for the Easy PV integration."""
+
+import logging
+from asyncio import Semaphore
+from datetime import date, datetime
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import BACKFILL_CONCURRENCY, DOMAIN
+from .coordinator import REQUEST_ERRORS, EasyPVCoordinator, gather_ordered
+from .decoding import decode_device
+from .easy_pv import LoginError, NoDataError
+from .model import PVDevice
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Energy per month ("YYYY-MM") by device key, None for months without data
+type Checkpoints = dict[str, dict[str, float | None]]
+
+
+def past_months(today: date, count: int) -> list[str]:
+    """Return the `count` months before the month of `today`, oldest first."""
+    index = today.year * 12 + today.month - 1
+    return [
+        f"{month // 12}-{month % 12 + 1:02d}" for month in range(index - count, index)
+    ]
+
+
+def statistic_id(key: str) -> str:
+    """Return the ID of the energy statistic of a device."""
+    return f"{DOMAIN}:{slugify(key)}_energy"
+
+
+class BackfillStore:
+    """Stores which months have been backfilled in Home Assistant storage."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the checkpoint store."""
+        self._store = Store[Checkpoints](
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.backfill"
+        )
+
+    async def async_load(self) -> Checkpoints:
+        """Load the checkpoints of previous runs."""
+        return await self._store.async_load() or {}
+
+    def async_schedule_save(self, checkpoints: Checkpoints) -> None:
+        """Schedule saving the checkpoints."""
+        self._store.async_delay_save(lambda: checkpoints, SAVE_DELAY)
+
+    async def async_save(self, checkpoints: Checkpoints) -> None:
+        """Save the checkpoints right away."""
+        await self._store.async_save(checkpoints)
+
+    async def async_remove(self) -> None:
+        """Remove the stored checkpoints."""
+        await self._store.async_remove()
+
+
+@callback
+def _async_import_statistics(
+    hass: HomeAssistant, device: PVDevice, months: dict[str, float | None]
+) -> None:
+    """Import the monthly energy of a device as long-term statistics."""
+    timezone = dt_util.get_default_time_zone()
+    total = 0.0
+    statistics: list[StatisticData] = []
+    for month in sorted(months):
+        energy = months[month]
+        if energy is None:
+            continue
+
+        year, month_number = map(int, month.split("-"))
+        start = dt_util.as_utc(datetime(year, month_number, 1, tzinfo=timezone))
+        total += energy
+        statistics.append(
+            StatisticData(
+                start=start.replace(minute=0, second=0, microsecond=0),
+                state=total,
+                sum=total,
+            )
+        )
+
+    if not statistics:
+        return
+
+    async_add_external_statistics(
+        hass,
+        StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{device.entity_name} energy",
+            source=DOMAIN,
+            statistic_id=statistic_id(device.entity_id),
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        ),
+        statistics,
+    )
+
+
+async def async_backfill(
+    hass: HomeAssistant, coordinator: EasyPVCoordinator, months: int
+) -> None:
+    """
+    Import the energy of past months of all devices into long-term statistics.
+
+    Fetched months are recorded as checkpoints, so an interrupted run resumes
+    where it stopped and no month is ever fetched twice. The statistics of a
+    device are imported again from all its checkpoints after each run, which
+    keeps the running sum consistent when earlier months are filled in later.
+    """
+    store = BackfillStore(hass, coordinator.config_entry.entry_id)
+    checkpoints = await store.async_load()
+    wanted = past_months(dt_util.now().date(), months)
+    limit = Semaphore(BACKFILL_CONCURRENCY)
+
+    async def _fetch(device: PVDevice, month: str) -> None:
+        done = checkpoints.setdefault(device.entity_id, {})
+        try:
+            async with limit:
+                payload = await coordinator.client.get_device_payload(
+                    device.station_id, device.id, month
+                )
+            data = decode_device(device.station_id, device.id, payload)
+        except LoginError:
+            raise
+        except NoDataError:
+            # The cloud has no data for months before the device was installed.
+            done[month] = None
+        except REQUEST_ERRORS:
+            LOGGER.warning(
+                "Error fetching %s of device %s, retry the backfill later",
+                month,
+                device.entity_id,
+            )
+            return
+        else:
+            done[month] = data.energy_month
+
+        store.async_schedule_save(checkpoints)
+
+    async def _backfill_device(device: PVDevice) -> None:
+        done = checkpoints.get(device.entity_id, {})
+        await gather_ordered(
+            _fetch(device, month) for month in wanted if month not in done
+        )
+        _async_import_statistics(hass, device, checkpoints.get(device.entity_id, {}))
+
+    devices = [
+        device
+        for station in (coordinator.data or {}).values()
+        for device in station.devices.values()
+    ]
+    try:
+        await gather_ordered(_backfill_device(device) for device in devices)
+    finally:
+        await store.async_save(checkpoints)
+
+    LOGGER.info("Backfilled %d months of %d devices", len(wanted), len(devices))
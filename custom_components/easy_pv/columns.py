@@ -0,0 +1,56 @@
+"""Columnar panel telemetry of the stations of the Easy PV integration."""
+
+from array import array
+from math import fsum
+
+from .model import PanelAggregates, PVStation
+
+
+class StationColumns:
+    """
+    Panel telemetry of a station stored column by column.
+
+    Power, voltage and current of all panels are kept in contiguous arrays of
+    doubles with one row per panel. The panels of a device occupy consecutive
+    rows, so device aggregates run over a slice of the arrays in C instead of
+    walking `PVPanel` objects. The coordinator builds the columns of a station
+    on first use after its data changed.
+    """
+
+    __slots__ = ("_devices", "current", "power", "voltage")
+
+    def __init__(self, station: PVStation) -> None:
+        """Lay out the panels of a station in rows."""
+        self._devices: dict[str, range] = {}
+        self.power = array("d")
+        self.voltage = array("d")
+        self.current = array("d")
+
+        for device in station.devices.values():
+            start = len(self.power)
+            for panel in device.panels:
+                self.power.append(panel.power)
+                self.voltage.append(panel.voltage)
+                self.current.append(panel.current)
+            self._devices[device.entity_id] = range(start, len(self.power))
+
+    def _aggregate(self, rows: range) -> PanelAggregates | None:
+        if not rows:
+            return None
+
+        power = memoryview(self.power)[rows.start : rows.stop]
+        voltage = memoryview(self.voltage)[rows.start : rows.stop]
+        return PanelAggregates(
+            count=len(rows),
+            power_total=fsum(power),
+            power_min=min(power),
+            power_max=max(power),
+            voltage_min=min(voltage),
+            voltage_max=max(voltage),
+            current_total=fsum(memoryview(self.current)[rows.start : rows.stop]),
+        )
+
+    def device_aggregates(self, key: str) -> PanelAggregates | None:
+        """Return the aggregates over the panels of a device by its entity key."""
+        rows = self._devices.get(key)
+        return self._aggregate(rows) if rows is not None else None
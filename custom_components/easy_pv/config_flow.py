@@ -8,13 +8,31 @@ from typing import TYPE_CHECKING, Any
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
-
-from .const import DOMAIN
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_HEARTBEAT,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_CONCURRENT_STATION_REQUESTS,
+    CONF_STALE_TIMEOUT,
+    CONF_TOPOLOGY_TTL,
+    DEADBAND_SENSOR_TYPES,
+    DEFAULT_DEADBAND_HEARTBEAT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_STATION_REQUESTS,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_TOPOLOGY_TTL,
+    DOMAIN,
+    POLL_INTERVAL_NIGHT,
+)
 from .easy_pv import EasyPVClient, LoginError
 
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigFlowResult
+    from homeassistant.config_entries import ConfigEntry, ConfigFlowResult
     from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,14 +44,43 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_STATION_REQUESTS,
+            default=DEFAULT_MAX_CONCURRENT_STATION_REQUESTS,
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_TOPOLOGY_TTL, default=DEFAULT_TOPOLOGY_TTL): vol.All(
+            vol.Coerce(int), vol.Range(min=60)
+        ),
+        **{
+            vol.Optional(f"{sensor_type}_{option}", default=0.0): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            )
+            for sensor_type in DEADBAND_SENSOR_TYPES
+            for option in (CONF_DEADBAND, CONF_DEADBAND_RELATIVE)
+        },
+        vol.Optional(
+            CONF_DEADBAND_HEARTBEAT, default=DEFAULT_DEADBAND_HEARTBEAT
+        ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_STALE_TIMEOUT, default=DEFAULT_STALE_TIMEOUT): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=int(POLL_INTERVAL_NIGHT.total_seconds())),
+        ),
+    }
+)
+
 
-async def validate_input(_: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """
     Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    hub = EasyPVClient()
+    hub = EasyPVClient(async_get_clientsession(hass))
 
     try:
         await hub.login_with_password(data[CONF_USERNAME], data[CONF_PASSWORD])
@@ -80,6 +127,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(_: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return OptionsFlow()
+
+
+class OptionsFlow(config_entries.OptionsFlow):
+    """Handle the options of an EasyPV config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self.config_entry.options, **user_input}
+            )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
+
 
 class CannotConnect(HomeAssistantError):  # noqa: N818
     """Error to indicate we cannot connect."""
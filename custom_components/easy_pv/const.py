@@ -1,6 +1,73 @@
 """Constants for the EasyPV integration."""
 
+from datetime import timedelta
+
 from homeassistant.const import Platform
 
 DOMAIN = "easy_pv"
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.DEVICE_TRACKER]
+
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_MAX_CONCURRENT_STATION_REQUESTS = "max_concurrent_station_requests"
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_MAX_CONCURRENT_STATION_REQUESTS = 4
+
+CONF_TOPOLOGY_TTL = "topology_ttl"
+
+DEFAULT_TOPOLOGY_TTL = 3600
+
+POLL_INTERVAL_DAY = timedelta(seconds=60)
+POLL_INTERVAL_RAMP = timedelta(seconds=30)
+POLL_INTERVAL_NIGHT = timedelta(minutes=15)
+
+# Sun elevation in degrees below which it is considered night (civil twilight)
+NIGHT_SUN_ELEVATION = -6.0
+# Sun elevation in degrees below which the output ramps up or down quickly
+RAMP_SUN_ELEVATION = 15.0
+# Relative change of the output between two refreshes that triggers fast polling
+RAMP_POWER_CHANGE = 0.2
+
+# Devices reporting no output for this many refreshes are only probed periodically
+IDLE_DEVICE_CYCLES = 5
+IDLE_DEVICE_PROBE_INTERVAL = timedelta(minutes=10)
+
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_DEADBAND_HEARTBEAT = "deadband_heartbeat"
+
+# Sensor types (translation keys) supporting deadband filtering
+DEADBAND_SENSOR_TYPES = ("power", "voltage", "current", "grid_voltage")
+
+DEFAULT_DEADBAND_HEARTBEAT = 600
+
+# Deadline in seconds for discovering the topology of an account
+TOPOLOGY_REFRESH_TIMEOUT = 20
+# Deadline in seconds for refreshing a single station
+STATION_REFRESH_TIMEOUT = 15
+# Backoff after failed station refreshes, doubled for each consecutive failure
+STATION_RETRY_DELAY = timedelta(minutes=1)
+STATION_RETRY_MAX_DELAY = timedelta(minutes=30)
+
+CONF_STALE_TIMEOUT = "stale_timeout"
+
+# Seconds the last good data is served while refreshes keep failing
+DEFAULT_STALE_TIMEOUT = 1800
+# Deadline in seconds for a single request within a refresh
+REQUEST_TIMEOUT = 10
+
+# Consecutive failures after which a device is no longer polled every refresh
+BREAKER_FAILURE_THRESHOLD = 3
+# Delay until an unreachable device is probed again, doubled after each failed probe
+BREAKER_PROBE_DELAY = timedelta(minutes=2)
+BREAKER_PROBE_MAX_DELAY = timedelta(hours=1)
+
+# Seconds the client reuses responses, absorbing refreshes requested in bursts
+CLIENT_CACHE_TTL = 5
+
+# Maximum concurrent requests of a statistics backfill
+BACKFILL_CONCURRENCY = 2
+DEFAULT_BACKFILL_MONTHS = 12
+
+# Size limit of the on-disk cache for device data of past months
+MONTH_CACHE_MAX_BYTES = 16 * 1024 * 1024
@@ -1,28 +1,118 @@
 """Coordinator for EasyPV integration."""
 
 import logging
-from asyncio import timeout
-from datetime import timedelta
+from asyncio import Semaphore, Task, TaskGroup, get_running_loop, timeout_at
+from collections.abc import Callable, Coroutine, Iterable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from typing import Any
 
+from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
-from .easy_pv import ApiError, EasyPVClient, LoginError
-from .model import PVDevice, PVPanel, PVStation
+from .columns import StationColumns
+from .const import (
+    CLIENT_CACHE_TTL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_CONCURRENT_STATION_REQUESTS,
+    CONF_STALE_TIMEOUT,
+    CONF_TOPOLOGY_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_STATION_REQUESTS,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_TOPOLOGY_TTL,
+    DOMAIN,
+    MONTH_CACHE_MAX_BYTES,
+    POLL_INTERVAL_DAY,
+    POLL_INTERVAL_NIGHT,
+    REQUEST_TIMEOUT,
+    STATION_REFRESH_TIMEOUT,
+    STATION_RETRY_DELAY,
+    STATION_RETRY_MAX_DELAY,
+    TOPOLOGY_REFRESH_TIMEOUT,
+)
+from .decoding import decode_device, decode_device_ids, decode_station
+from .easy_pv import (
+    ApiError,
+    EasyPVClient,
+    InvalidResponseError,
+    LoginError,
+    MonthCache,
+)
+from .model import (
+    PanelAggregates,
+    PVDevice,
+    PVEntity,
+    PVPanel,
+    PVStation,
+    PVStationTopology,
+    TopologyDiff,
+    device_key,
+    station_key,
+)
+from .scheduler import AdaptivePollScheduler, BreakerState, CircuitBreaker
+from .snapshot import Snapshot, SnapshotStore
 
 LOGGER = logging.getLogger(__name__)
 
+# Errors of a single request, other requests of a refresh may still succeed
+REQUEST_ERRORS = (ApiError, InvalidResponseError, ClientError, TimeoutError)
+
+
+@dataclass
+class _StationState:
+    """Refresh state of a single station."""
+
+    failures: int = 0
+    retry_at: datetime | None = None
+    last_success: datetime | None = None
+
+
+def month_cache_directory(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the directory of the cache for past months of a config entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.months")
+
+
+def _deadline_in(seconds: float) -> float:
+    """Return the event loop time `seconds` from now."""
+    return get_running_loop().time() + seconds
+
+
+def _request_deadline(deadline: float) -> float:
+    """Return the deadline of a single request within the deadline of a refresh."""
+    return min(deadline, _deadline_in(REQUEST_TIMEOUT))
+
+
+async def gather_ordered[R](coros: Iterable[Coroutine[Any, Any, R]]) -> list[R]:
+    """Run coroutines concurrently, keep their order and re-raise the first error."""
+    try:
+        async with TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as err:
+        raise err.exceptions[0]  # noqa: B904
+
+    return [task.result() for task in tasks]
+
 
 class EasyPVCoordinator(DataUpdateCoordinator[dict[str, PVStation]]):
     """My custom coordinator."""
 
     def __init__(
-        self, hass: HomeAssistant, config_entry: ConfigEntry["EasyPVCoordinator"]
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry["EasyPVCoordinator"],
+        client: EasyPVClient | None = None,
     ) -> None:
         """Initialize my coordinator."""
         super().__init__(
@@ -30,89 +120,467 @@ class EasyPVCoordinator(DataUpdateCoordinator[dict[str, PVStation]]):
             LOGGER,
             name="EasyPV Coordinator",
             config_entry=config_entry,
-            update_interval=timedelta(seconds=60),
-            always_update=True,
+            update_interval=POLL_INTERVAL_DAY,
+            always_update=False,
         )
         self._config_entry = config_entry
-        self._client = EasyPVClient()
+        self._client = client or EasyPVClient(
+            async_get_clientsession(hass),
+            cache_ttl=CLIENT_CACHE_TTL,
+            month_cache=MonthCache(
+                month_cache_directory(hass, config_entry.entry_id),
+                MONTH_CACHE_MAX_BYTES,
+            ),
+        )
+        max_requests: int = config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+        self._request_limit = Semaphore(max_requests)
+        self._max_station_requests: int = config_entry.options.get(
+            CONF_MAX_CONCURRENT_STATION_REQUESTS,
+            DEFAULT_MAX_CONCURRENT_STATION_REQUESTS,
+        )
+        # Only as many stations refresh at once as can send all their requests,
+        # so the deadline of a station is not used up waiting for the others.
+        self._station_limit = Semaphore(
+            max(1, max_requests // self._max_station_requests)
+        )
+        self._topology: dict[str, PVStationTopology] | None = None
+        self._topology_updated: datetime | None = None
+        self._topology_ttl = timedelta(
+            seconds=config_entry.options.get(CONF_TOPOLOGY_TTL, DEFAULT_TOPOLOGY_TTL)
+        )
+        self._topology_changed = False
+        self._scheduler = AdaptivePollScheduler()
+        self._breaker = CircuitBreaker()
+        self._index: dict[str, PVEntity] = {}
+        # Panel columns of a station and the data they were built from
+        self._columns: dict[str, tuple[PVStation, StationColumns]] = {}
+        self._topology_listeners: list[Callable[[TopologyDiff], None]] = []
+        self._keyed_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._unkeyed_listeners: list[CALLBACK_TYPE] = []
+        self._listener_status: tuple[bool, bool] | None = None
+        self._station_states: dict[str, _StationState] = {}
+        self._refreshed: dict[str, datetime] = {}
+        self._stale: set[str] = set()
+        # Data is refreshed at least once per night interval, anything shorter
+        # would make all entities unavailable.
+        self._stale_timeout = max(
+            timedelta(
+                seconds=config_entry.options.get(
+                    CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT
+                )
+            ),
+            POLL_INTERVAL_NIGHT,
+        )
+        self._refresh_dispatched = False
+        # Digest of the last decoded response of a device and the device built
+        # from it, which is only valid while that device is still the current one
+        self._fingerprints: dict[str, tuple[bytes, PVDevice]] = {}
+        self._snapshot_store = SnapshotStore(hass, config_entry.entry_id)
+
+    @property
+    def client(self) -> EasyPVClient:
+        """Return the client used to access the Easy PV cloud."""
+        return self._client
 
     @property
     def is_logged_in(self) -> bool:
         """Check if the client is logged in."""
         return self._client.is_logged_in
 
-    async def fetch_device(self, station_id: str, device_id: str) -> PVDevice:
-        """Fetch a specific device by its ID."""
-        data = await self._client.get_device_data(station_id, device_id)
-
-        return PVDevice(
-            entity_id=f"{station_id}_{device_id}",
-            entity_name=data["productCode"],
-            id=device_id,
-            station_id=station_id,
-            power=data["genPower"],
-            energy_month=data["genpowerMonthTotals"],
-            energy_today=data["genpowerTodayTotals"],
-            product_code=data["productCode"],
-            device_serial=data["deviceNum"],
-            grid_voltage=data["gridVoltage"],
-            app_fw=data["appFirmVer"],
-            net_fw=data["netFirmVer"],
-            panels=[
-                PVPanel(
-                    entity_id=f"{station_id}_{device_id}_panel_{panel_data['sort']}",
-                    entity_name=f"{data['productCode']} Panel {panel_data['sort']}",
-                    idx=int(panel_data["sort"]) - 1,
-                    station_id=station_id,
-                    device_id=device_id,
-                    power=panel_data["genPower"],
-                    current=panel_data["current"],
-                    voltage=panel_data["voltage"],
-                )
-                for panel_data in data.get("devicePhotovoltaicPanel", [])
-            ],
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and release the client."""
+        await super().async_shutdown()
+        await self._client.close()
+
+    async def fetch_device(
+        self,
+        station_id: str,
+        device_id: str,
+        previous: PVDevice | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> PVDevice:
+        """
+        Fetch a specific device by its ID.
+
+        Parts of the previous data of the device that did not change are reused.
+        If the raw response is identical to the one `previous` was built from it
+        is returned without decoding the response at all.
+        """
+        payload = await self._client.get_device_payload(
+            station_id, device_id, deadline=deadline
+        )
+        key = device_key(station_id, device_id)
+        fingerprint = blake2b(payload, digest_size=16).digest()
+        decoded = self._fingerprints.get(key)
+        if (
+            previous is not None
+            and decoded is not None
+            and decoded[0] == fingerprint
+            and decoded[1] is previous
+        ):
+            return previous
+
+        device = decode_device(station_id, device_id, payload, previous)
+        self._fingerprints[key] = (fingerprint, device)
+        return device
+
+    @property
+    def topology_expired(self) -> bool:
+        """Check if the cached topology has to be rediscovered."""
+        if self._topology is None or self._topology_updated is None:
+            return True
+
+        # Station energy totals are extrapolated from the daily totals, so the
+        # topology is rediscovered once the day rolls over.
+        return (
+            dt_util.utcnow() - self._topology_updated > self._topology_ttl
+            or dt_util.as_local(self._topology_updated).date() != dt_util.now().date()
         )
 
-    async def _fetch_devices(self, station_id: str) -> list[PVDevice]:
-        """Fetch the list of devices for a given station."""
+    def invalidate_topology(self) -> None:
+        """Force the topology to be rediscovered on the next refresh."""
+        self._topology_updated = None
+
+    async def async_refresh_topology(self) -> None:
+        """Rediscover stations and devices and refresh their data."""
+        self.invalidate_topology()
+        await self.async_request_refresh()
+
+    async def _fetch_device_ids(
+        self, station_id: str, deadline: float
+    ) -> tuple[str, ...]:
+        """Fetch the IDs of all devices of a given station."""
         try:
-            data = await self._client.get_station_devices(station_id)
-            return [
-                await self.fetch_device(station_id, device["id"]) for device in data
-            ]
-        except ApiError as err:
+            async with self._request_limit:
+                data = await self._client.get_station_devices(
+                    station_id, deadline=_request_deadline(deadline)
+                )
+            return decode_device_ids(data)
+        except LoginError:
+            raise
+        except (ApiError, InvalidResponseError) as err:
             raise UpdateFailed(
                 f"Error fetching devices for station {station_id}"
             ) from err
 
-    async def _fetch_stations(self) -> list[PVStation]:
-        """Fetch the list of PV stations from the API."""
+    async def _fetch_topology(
+        self,
+        deadline: float,
+        on_station: Callable[[PVStationTopology], None] | None = None,
+    ) -> dict[str, PVStationTopology]:
+        """
+        Discover all stations and their devices before the deadline.
+
+        Stations are processed as their page of the station list arrives, so the
+        devices of early stations are discovered while later pages are still
+        downloading. `on_station` is called for every complete station.
+
+        A station that is invalid or whose devices cannot be fetched keeps its
+        cached topology, or is left out until the next discovery if it is new,
+        so a single broken station does not fail the discovery of all others.
+        """
+        topology: dict[str, PVStationTopology] = {}
+        failed = 0
+
+        def _add(station: PVStationTopology) -> None:
+            topology[station.id] = station
+            if on_station is not None:
+                on_station(station)
+
+        def _keep_cached(station_id: str, err: Exception) -> None:
+            nonlocal failed
+            failed += 1
+            known = (self._topology or {}).get(station_id)
+            if known is None:
+                LOGGER.warning("Skipping station %s: %s", station_id, err)
+                return
+            LOGGER.warning("Using cached topology of station %s: %s", station_id, err)
+            _add(known)
+
+        async def _discover(station: PVStationTopology) -> None:
+            try:
+                device_ids = await self._fetch_device_ids(station.id, deadline)
+            except LoginError:
+                raise
+            except (UpdateFailed, *REQUEST_ERRORS) as err:
+                _keep_cached(station.id, err)
+                return
+
+            _add(replace(station, device_ids=device_ids))
+
+        # The client caps the concurrent pages of the station list itself.
         try:
-            data = await self._client.get_stations()
-            return [
-                PVStation(
-                    entity_id=station["id"],
-                    entity_name=station["name"],
-                    id=station["id"],
-                    name=station["name"],
-                    address=station["address"],
-                    location=station["plantLocation"],
-                    latitude=station["latitude"],
-                    longitude=station["longitude"],
-                    power=station["genPower"],
-                    energy_today=station["todayPowerTotals"],
-                    energy_total=station["powerTotals"],
-                    devices={
-                        device.id: device
-                        for device in await self._fetch_devices(station["id"])
-                    },
+            async with TaskGroup() as group:
+                async for row in self._client.iter_stations(deadline=deadline):
+                    try:
+                        station = decode_station(row)
+                    except InvalidResponseError as err:
+                        _keep_cached(
+                            str(row.get("id")) if isinstance(row, dict) else "", err
+                        )
+                        continue
+                    group.create_task(_discover(station))
+        except BaseExceptionGroup as err:
+            first = err.exceptions[0]
+            if isinstance(first, ApiError | InvalidResponseError) and not isinstance(
+                first, LoginError
+            ):
+                raise UpdateFailed("Error fetching stations") from first
+            raise first  # noqa: B904
+
+        if failed and not topology:
+            raise UpdateFailed("Error discovering all stations")
+
+        return topology
+
+    async def _async_update_topology(
+        self, on_station: Callable[[PVStationTopology], None] | None = None
+    ) -> dict[str, PVStationTopology]:
+        """
+        Return the cached topology, rediscovering it if it has expired.
+
+        `on_station` is only called for stations that are rediscovered.
+        """
+        if self._topology is not None and not self.topology_expired:
+            return self._topology
+
+        deadline = _deadline_in(TOPOLOGY_REFRESH_TIMEOUT)
+        try:
+            async with timeout_at(deadline):
+                self._topology = await self._fetch_topology(deadline, on_station)
+        except LoginError:
+            raise
+        except (UpdateFailed, *REQUEST_ERRORS) as err:
+            if self._topology is None:
+                raise UpdateFailed("Error fetching topology") from err
+            LOGGER.warning("Failed to refresh topology, using cached topology")
+        else:
+            self._topology_updated = dt_util.utcnow()
+            self._topology_changed = True
+
+        return self._topology
+
+    async def _fetch_devices(
+        self, topology: PVStationTopology, deadline: float
+    ) -> list[PVDevice]:
+        """
+        Fetch the data of all devices of a station before the deadline.
+
+        Every request gets at most `REQUEST_TIMEOUT` of the remaining time, so a
+        single hanging device does not use up the time of the others. Devices
+        that fail keep their last good data, devices that keep failing are only
+        probed occasionally by the circuit breaker. If several devices all fail,
+        the cause is the cloud or the account, so the breakers are left alone
+        and the station backs off instead.
+        """
+        station_id = topology.id
+        station_limit = Semaphore(self._max_station_requests)
+        now = dt_util.utcnow()
+        night = self._scheduler.is_night(topology, now)
+        attempts = 0
+        failed: list[str] = []
+
+        async def _fetch(device_id: str) -> PVDevice | None:
+            nonlocal attempts
+            key = device_key(station_id, device_id)
+            previous = self._index.get(key)
+            if not isinstance(previous, PVDevice):
+                previous = None
+
+            if not self._breaker.allow(key, now):
+                return previous
+
+            if previous is not None and not self._scheduler.should_poll(
+                key, now, night=night
+            ):
+                return previous
+
+            attempts += 1
+            try:
+                async with station_limit, self._request_limit:
+                    device = await self.fetch_device(
+                        station_id,
+                        device_id,
+                        previous,
+                        deadline=_request_deadline(deadline),
+                    )
+            except LoginError:
+                raise
+            except REQUEST_ERRORS as err:
+                failed.append(key)
+                LOGGER.debug(
+                    "Error fetching device %s, using last good data: %r", key, err
                 )
-                for station in data
-            ]
-        except ApiError as err:
-            raise UpdateFailed("Error fetching stations") from err
+                return previous
+
+            self._breaker.record_success(key)
+            self._scheduler.record_device(device, now)
+            self._refreshed[key] = now
+            return device
+
+        devices = await gather_ordered(
+            _fetch(device_id) for device_id in topology.device_ids
+        )
+
+        # Several devices failing together point at the cloud or the account.
+        if attempts == 1 or len(failed) < attempts:
+            for key in failed:
+                self._breaker.record_failure(key, now)
+
+        if failed and len(failed) == attempts:
+            raise UpdateFailed(f"Error fetching devices for station {station_id}")
+
+        return [device for device in devices if device is not None]
+
+    async def _fetch_station(
+        self, topology: PVStationTopology, deadline: float
+    ) -> PVStation:
+        """Fetch the data of a station described by its topology."""
+        devices = await self._fetch_devices(topology, deadline)
+        energy_today = sum(device.energy_today for device in devices)
+
+        station = PVStation(
+            entity_id=topology.id,
+            entity_name=topology.name,
+            id=topology.id,
+            name=topology.name,
+            address=topology.address,
+            location=topology.location,
+            latitude=topology.latitude,
+            longitude=topology.longitude,
+            power=sum(device.power for device in devices),
+            energy_today=energy_today,
+            energy_total=topology.energy_total
+            + max(0.0, energy_today - topology.energy_today),
+            devices={device.id: device for device in devices},
+        )
+
+        # Keep the previous object if nothing changed so unchanged stations are
+        # shared between snapshots.
+        previous = self._index.get(station_key(topology.id))
+        if isinstance(previous, PVStation) and previous == station:
+            return previous
+
+        return station
+
+    async def _refresh_station(
+        self, topology: PVStationTopology, now: datetime
+    ) -> tuple[PVStation | None, bool | None]:
+        """
+        Refresh a single station within its own deadline.
+
+        Returns the station data and whether the refresh succeeded, or None if the
+        station is waiting for a retry. If the refresh fails or is skipped, the
+        last good data of the station is returned.
+
+        The deadline starts once the station gets its turn, stations waiting
+        for other stations to finish do not lose any of it.
+        """
+        state = self._station_states.setdefault(topology.id, _StationState())
+        previous = self._index.get(station_key(topology.id))
+        last_good = previous if isinstance(previous, PVStation) else None
+
+        if state.retry_at is not None and now < state.retry_at:
+            return last_good, None
+
+        try:
+            async with self._station_limit:
+                deadline = _deadline_in(STATION_REFRESH_TIMEOUT)
+                async with timeout_at(deadline):
+                    station = await self._fetch_station(topology, deadline)
+        except LoginError:
+            raise
+        except (UpdateFailed, *REQUEST_ERRORS) as err:
+            state.failures += 1
+            # The exponent is capped so long outages cannot overflow timedelta.
+            delay = min(
+                STATION_RETRY_DELAY * 2 ** min(state.failures - 1, 10),
+                STATION_RETRY_MAX_DELAY,
+            )
+            state.retry_at = now + delay
+            LOGGER.warning(
+                "Error refreshing station %s, retrying in %s: %s",
+                topology.id,
+                delay,
+                err or type(err).__name__,
+            )
+            return last_good, False
+
+        state.failures = 0
+        state.retry_at = None
+        state.last_success = now
+        self._refreshed[station.entity_id] = now
+        return station, True
+
+    async def _fetch_stations(self) -> list[PVStation]:
+        """
+        Fetch the data of all known PV stations.
+
+        While the topology is rediscovered, every station is refreshed as soon
+        as its devices are known instead of waiting for the whole station list.
+        """
+        now = dt_util.utcnow()
+        refreshes: dict[str, Task[tuple[PVStation | None, bool | None]]] = {}
 
-    async def _async_setup(self) -> None:
+        try:
+            async with TaskGroup() as group:
+
+                def _refresh(station: PVStationTopology) -> None:
+                    refreshes[station.id] = group.create_task(
+                        self._refresh_station(station, now)
+                    )
+
+                topology = await self._async_update_topology(_refresh)
+                # Stations of a cached topology have not been started yet.
+                for station in topology.values():
+                    if station.id not in refreshes:
+                        _refresh(station)
+        except BaseExceptionGroup as err:
+            raise err.exceptions[0]  # noqa: B904
+
+        for station_id in self._station_states.keys() - topology.keys():
+            del self._station_states[station_id]
+
+        # Stations missing from a fallback topology were refreshed for nothing.
+        results = [refreshes[station_id].result() for station_id in topology]
+
+        attempted = [success for _, success in results if success is not None]
+        if attempted and not any(attempted):
+            raise UpdateFailed("Error fetching stations")
+
+        return [station for station, _ in results if station is not None]
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last known topology and data from storage."""
+        snapshot = await self._snapshot_store.async_load()
+        if snapshot is None:
+            return False
+
+        # Restored entities are only available while logged in, so the stored
+        # token is used right away and checked by the first refresh.
+        self._client.use_token(self._config_entry.data["token"])
+        self._topology = snapshot.topology
+        self._topology_updated = snapshot.topology_updated
+        self.data = snapshot.stations
+        self._rebuild_index()
+
+        # The snapshot is saved together with the topology, so its data is as old
+        # as the topology.
+        if snapshot.topology_updated is not None:
+            self._refreshed = dict.fromkeys(
+                (
+                    key
+                    for key, data in self._index.items()
+                    if isinstance(data, PVStation | PVDevice)
+                ),
+                snapshot.topology_updated,
+            )
+        return True
+
+    async def _async_login(self) -> None:
         try:
             await self._client.login_with_token(self._config_entry.data["token"])
 
@@ -121,45 +589,256 @@ class EasyPVCoordinator(DataUpdateCoordinator[dict[str, PVStation]]):
         except ApiError as err:
             raise UpdateFailed("Error communicating with API") from err
 
+    async def _async_setup(self) -> None:
+        await self._async_login()
+
     async def _async_update_data(self) -> dict[str, PVStation]:
         """Fetch data from API endpoint."""
+        # Refreshes started from a restored snapshot skip _async_setup and use the
+        # stored token as is, requests with an expired token raise LoginError.
+        if not self.is_logged_in:
+            await self._async_login()
+
         try:
-            async with timeout(20):
-                return {station.id: station for station in await self._fetch_stations()}
+            data = {station.id: station for station in await self._fetch_stations()}
 
         except LoginError as err:
             raise ConfigEntryAuthFailed from err
         except ApiError as err:
             raise UpdateFailed("Error communicating with API") from err
 
-    def enumerate_devices(self) -> set[str]:
-        """Enumerate all devices across all stations."""
-        devices: set[str] = set()
-        for station in self.data.values():
-            devices.add(station.entity_id)
+        self.update_interval = self._scheduler.next_interval(data, dt_util.utcnow())
+
+        if self._topology_changed and self._topology is not None:
+            self._topology_changed = False
+            self._snapshot_store.async_schedule_save(
+                Snapshot(
+                    topology=self._topology,
+                    topology_updated=self._topology_updated,
+                    stations=data,
+                )
+            )
+
+        return data
+
+    def _rebuild_index(self) -> set[str]:
+        """
+        Rebuild the index of all stations, devices and panels by entity key.
+
+        Returns the keys whose data changed. Unchanged data is shared between
+        snapshots, so an identical object means nothing below it changed either.
+        """
+        previous = self._index
+        index: dict[str, PVEntity] = {}
+        changed: set[str] = set()
+        for station in (self.data or {}).values():
+            index[station.entity_id] = station
+            station_changed = previous.get(station.entity_id) is not station
+            if station_changed:
+                changed.add(station.entity_id)
+
             for station_device in station.devices.values():
-                devices.add(station_device.entity_id)
+                index[station_device.entity_id] = station_device
+                device_changed = (
+                    station_changed
+                    and previous.get(station_device.entity_id) is not station_device
+                )
+                if device_changed:
+                    changed.add(station_device.entity_id)
+
                 for panel in station_device.panels or []:
-                    devices.add(panel.entity_id)
+                    index[panel.entity_id] = panel
+                    if device_changed and previous.get(panel.entity_id) is not panel:
+                        changed.add(panel.entity_id)
 
-        return devices
+        self._index = index
+        return changed
 
-    def get_station(self, station_id: str) -> PVStation | None:
-        """Get a specific station by its ID."""
-        return self.data.get(station_id, None)
+    def _update_stale(self) -> set[str]:
+        """Update which data is stale and return the keys whose staleness changed."""
+        now = dt_util.utcnow()
+        stale = {key for key in self._refreshed if self._is_stale(key, now)}
+        toggled = stale ^ self._stale
+        self._stale = stale
 
-    def get_device(self, station_id: str, device_id: str) -> PVDevice | None:
-        """Get a specific device by its ID."""
-        station = self.get_station(station_id)
-        return station.devices.get(device_id, None) if station else None
+        changed = set(toggled)
+        for key in toggled:
+            data = self._index.get(key)
+            if isinstance(data, PVDevice):
+                changed.update(panel.entity_id for panel in data.panels)
 
-    def get_panel(
-        self, station_id: str, device_id: str, panel_number: int
-    ) -> PVPanel | None:
-        """Get a specific panel by its index."""
-        device = self.get_device(station_id, device_id)
-        return (
-            device.panels[panel_number]
-            if device and len(device.panels) > panel_number
-            else None
+        return changed
+
+    def _refresh_key(self, key: str) -> str:
+        """Return the key whose refresh time applies to the data of a key."""
+        data = self._index.get(key)
+        if isinstance(data, PVPanel):
+            return device_key(data.station_id, data.device_id)
+        return key
+
+    def _is_stale(self, key: str, now: datetime) -> bool:
+        refreshed = self._refreshed.get(key)
+        return refreshed is not None and now - refreshed > self._stale_timeout
+
+    def last_refreshed(self, key: str) -> datetime | None:
+        """Return when the data of a station, device or panel was last refreshed."""
+        return self._refreshed.get(self._refresh_key(key))
+
+    def breaker_state(self, key: str) -> BreakerState:
+        """Return the circuit breaker state of a device."""
+        return self._breaker.state(key, dt_util.utcnow())
+
+    def _station_columns(self, station: PVStation) -> StationColumns:
+        """Return the panel columns of a station, built on first use."""
+        cached = self._columns.get(station.entity_id)
+        if cached is not None and cached[0] is station:
+            return cached[1]
+
+        columns = StationColumns(station)
+        self._columns[station.entity_id] = (station, columns)
+        return columns
+
+    def panel_aggregates(self, key: str) -> PanelAggregates | None:
+        """Return the aggregates over the panels of a device by its entity key."""
+        data = self._index.get(key)
+        if not isinstance(data, PVDevice):
+            return None
+
+        station = self._index.get(station_key(data.station_id))
+        if not isinstance(station, PVStation):
+            return None
+
+        return self._station_columns(station).device_aggregates(key)
+
+    def is_stale(self, key: str) -> bool:
+        """Check if the data of a key is older than the staleness window."""
+        return self._is_stale(self._refresh_key(key), dt_util.utcnow())
+
+    @staticmethod
+    def _diff(
+        previous: dict[str, PVEntity], current: dict[str, PVEntity]
+    ) -> TopologyDiff:
+        """Compute the topology changes between two indexes."""
+        added = [entity for key, entity in current.items() if key not in previous]
+
+        return TopologyDiff(
+            added_stations=tuple(e for e in added if isinstance(e, PVStation)),
+            added_devices=tuple(e for e in added if isinstance(e, PVDevice)),
+            added_panels=tuple(e for e in added if isinstance(e, PVPanel)),
+            removed=frozenset(previous.keys() - current.keys()),
+        )
+
+    def current_topology(self) -> TopologyDiff:
+        """Return the current topology as if all of it was just added."""
+        return self._diff({}, self._index)
+
+    @callback
+    def async_add_topology_listener(
+        self, update_callback: Callable[[TopologyDiff], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for stations, devices and panels being added or removed."""
+        self._topology_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._topology_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_remove_stale_devices(self, keys: Iterable[str]) -> None:
+        """Remove devices that no longer exist from this config entry."""
+        device_registry = dr.async_get(self.hass)
+        for key in keys:
+            device = device_registry.async_get_device(identifiers={(DOMAIN, key)})
+            if device:
+                device_registry.async_update_device(
+                    device_id=device.id,
+                    remove_config_entry_id=self._config_entry.entry_id,
+                )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """
+        Listen for data updates.
+
+        Listeners registered with an entity key as context are only called when
+        the data of that key changed.
+        """
+        remove = super().async_add_listener(update_callback, context)
+        listeners = (
+            self._keyed_listeners.setdefault(context, [])
+            if isinstance(context, str)
+            else self._unkeyed_listeners
         )
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            listeners.remove(update_callback)
+            if not listeners and isinstance(context, str):
+                self._keyed_listeners.pop(context, None)
+
+        return remove_listener
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """
+        Update the listeners after every refresh.
+
+        The base class skips the update if the data is equal or two refreshes
+        in a row failed, but staleness and the diagnostic sensors still change.
+        The update the base class may send right after this one is skipped.
+        """
+        super()._async_refresh_finished()
+        self.async_update_listeners()
+        self._refresh_dispatched = True
+        self.hass.loop.call_soon(self._clear_refresh_dispatched)
+
+    def _clear_refresh_dispatched(self) -> None:
+        self._refresh_dispatched = False
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the index and the listeners of all changed keys."""
+        if self._refresh_dispatched:
+            self._refresh_dispatched = False
+            return
+
+        previous = self._index
+        changed = self._rebuild_index()
+
+        # The topology only has to be diffed if the set of keys changed.
+        if self._index.keys() != previous.keys():
+            diff = self._diff(previous, self._index)
+            for key in diff.removed:
+                self._refreshed.pop(key, None)
+                self._breaker.forget(key)
+                self._fingerprints.pop(key, None)
+                self._columns.pop(key, None)
+            self._async_remove_stale_devices(diff.removed)
+            for update_callback in list(self._topology_listeners):
+                update_callback(diff)
+
+        changed |= self._update_stale()
+
+        # Availability affects all entities, so changes to it are broadcast.
+        status = (self.last_update_success, self.is_logged_in)
+        if status != self._listener_status:
+            self._listener_status = status
+            super().async_update_listeners()
+            return
+
+        for update_callback in list(self._unkeyed_listeners):
+            update_callback()
+
+        for key in changed:
+            for update_callback in list(self._keyed_listeners.get(key, ())):
+                update_callback()
+
+    def get_entity_data(self, key: str) -> PVEntity | None:
+        """Get a station, device or panel by its entity key."""
+        return self._index.get(key)
@@ -0,0 +1,265 @@
+"""
+Decoding of Easy PV API responses into the models of the integration.
+
+Every response object is checked against a schema compiled once at import: a
+single `itemgetter` pulls all fields and a converter per field validates them.
+A missing or malformed field raises `InvalidResponseError` naming the field,
+so it is handled like any other bad response instead of surfacing as a
+`KeyError` in the middle of a refresh.
+"""
+
+from collections.abc import Callable, Mapping
+from operator import itemgetter
+from typing import Any
+
+from .easy_pv import EasyPVClient, InvalidResponseError
+from .model import (
+    PVDevice,
+    PVDeviceInfo,
+    PVPanel,
+    PVStationTopology,
+    device_key,
+    panel_key,
+)
+
+
+def _text(value: Any) -> str:
+    """Convert a text field, the API sends null for unknown values."""
+    return "" if value is None else str(value)
+
+
+def _optional_float(value: Any) -> float | None:
+    """Convert an optional number, the API sends null or "" for unknown values."""
+    return None if value is None or value == "" else float(value)
+
+
+class _Schema:
+    """Fields of a response object with the converter validating each of them."""
+
+    __slots__ = ("_converters", "_getter", "_keys", "_name")
+
+    def __init__(self, name: str, fields: Mapping[str, Callable[[Any], Any]]) -> None:
+        """Compile the lookup of all fields."""
+        self._name = name
+        self._keys = tuple(fields)
+        self._converters = tuple(fields.values())
+        getter = itemgetter(*self._keys)
+        self._getter: Callable[[Any], tuple[Any, ...]] = (
+            getter if len(self._keys) > 1 else lambda data: (getter(data),)
+        )
+
+    def decode(self, data: Any) -> tuple[Any, ...]:
+        """Return the converted values of all fields in schema order."""
+        try:
+            values = self._getter(data)
+        except KeyError as err:
+            raise InvalidResponseError(f"{self._name} without {err.args[0]}") from err
+        except TypeError as err:
+            raise InvalidResponseError(f"{self._name} is not an object") from err
+
+        try:
+            return tuple(
+                convert(value)
+                for convert, value in zip(self._converters, values, strict=True)
+            )
+        except (TypeError, ValueError) as err:
+            raise InvalidResponseError(self._invalid_field(values)) from err
+
+    def _invalid_field(self, values: tuple[Any, ...]) -> str:
+        """Describe the first field that fails to convert."""
+        for key, convert, value in zip(
+            self._keys, self._converters, values, strict=True
+        ):
+            try:
+                convert(value)
+            except (TypeError, ValueError):
+                return f"{self._name} with invalid {key}: {value!r}"
+
+        return f"invalid {self._name}"
+
+
+_STATION = _Schema(
+    "station",
+    {
+        "id": str,
+        "name": _text,
+        "address": _text,
+        "plantLocation": _text,
+        "latitude": _optional_float,
+        "longitude": _optional_float,
+        "powerTotals": float,
+        "todayPowerTotals": float,
+    },
+)
+_STATION_DEVICE = _Schema("station device", {"id": str})
+_DEVICE_INFO = _Schema(
+    "device data",
+    {
+        "productCode": _text,
+        "deviceNum": _text,
+        "appFirmVer": _text,
+        "netFirmVer": _text,
+    },
+)
+_DEVICE_VALUES = _Schema(
+    "device data",
+    {
+        "genPower": float,
+        "genpowerMonthTotals": float,
+        "genpowerTodayTotals": float,
+        "gridVoltage": float,
+    },
+)
+_PANEL = _Schema(
+    "panel", {"sort": int, "genPower": float, "current": float, "voltage": float}
+)
+
+
+def decode_station(data: Any) -> PVStationTopology:
+    """Decode a row of the station list, its devices are added by the caller."""
+    (
+        station_id,
+        name,
+        address,
+        location,
+        latitude,
+        longitude,
+        energy_total,
+        energy_today,
+    ) = _STATION.decode(data)
+
+    return PVStationTopology(
+        id=station_id,
+        name=name,
+        address=address,
+        location=location,
+        latitude=latitude,
+        longitude=longitude,
+        energy_total=energy_total,
+        energy_today=energy_today,
+        device_ids=(),
+    )
+
+
+def decode_device_ids(data: Any) -> tuple[str, ...]:
+    """Decode the device list of a station into the device IDs."""
+    if not isinstance(data, list):
+        raise InvalidResponseError("station devices is not a list")
+
+    return tuple(_STATION_DEVICE.decode(device)[0] for device in data)
+
+
+def _decode_device_info(data: Any, previous: PVDevice | None) -> PVDeviceInfo:
+    """Decode the static metadata of a device, reusing the previous one if equal."""
+    product_code, device_serial, app_fw, net_fw = _DEVICE_INFO.decode(data)
+    if previous is not None and (
+        previous.info.product_code == product_code
+        and previous.info.device_serial == device_serial
+        and previous.info.app_fw == app_fw
+        and previous.info.net_fw == net_fw
+    ):
+        return previous.info
+
+    return PVDeviceInfo(
+        product_code=product_code,
+        device_serial=device_serial,
+        app_fw=app_fw,
+        net_fw=net_fw,
+    )
+
+
+def _decode_panels(
+    station_id: str,
+    device_id: str,
+    info: PVDeviceInfo,
+    panels: Any,
+    previous: PVDevice | None,
+) -> tuple[PVPanel, ...]:
+    """Decode the panels of a device, reusing previous panels that are unchanged."""
+    if not isinstance(panels, list):
+        raise InvalidResponseError("panels is not a list")
+
+    reusable = previous.panels if previous and previous.info is info else ()
+    result: list[PVPanel] = []
+
+    for position, panel_data in enumerate(panels):
+        sort, power, current, voltage = _PANEL.decode(panel_data)
+        idx = sort - 1
+        old = reusable[position] if position < len(reusable) else None
+        if (
+            old is not None
+            and old.idx == idx
+            and old.power == power
+            and old.current == current
+            and old.voltage == voltage
+        ):
+            result.append(old)
+            continue
+
+        result.append(
+            PVPanel(
+                entity_id=panel_key(station_id, device_id, idx),
+                entity_name=f"{info.product_code} Panel {sort}",
+                idx=idx,
+                station_id=station_id,
+                device_id=device_id,
+                power=power,
+                current=current,
+                voltage=voltage,
+            )
+        )
+
+    if len(result) == len(reusable) and all(
+        new is old for new, old in zip(result, reusable, strict=True)
+    ):
+        return reusable
+
+    return tuple(result)
+
+
+def decode_device(
+    station_id: str,
+    device_id: str,
+    payload: bytes,
+    previous: PVDevice | None = None,
+) -> PVDevice:
+    """
+    Decode a raw device data response, sharing unchanged parts with `previous`.
+
+    Raises `ApiError` if the cloud reports an error and `InvalidResponseError`
+    if the data does not match the schema.
+    """
+    data = EasyPVClient.parse_device_payload(payload)
+    info = _decode_device_info(data, previous)
+    panels = _decode_panels(
+        station_id,
+        device_id,
+        info,
+        data.get("devicePhotovoltaicPanel") or [],
+        previous,
+    )
+    power, energy_month, energy_today, grid_voltage = _DEVICE_VALUES.decode(data)
+
+    if (
+        previous is not None
+        and previous.info is info
+        and previous.panels is panels
+        and previous.power == power
+        and previous.energy_month == energy_month
+        and previous.energy_today == energy_today
+        and previous.grid_voltage == grid_voltage
+    ):
+        return previous
+
+    return PVDevice(
+        entity_id=device_key(station_id, device_id),
+        entity_name=info.product_code,
+        id=device_id,
+        station_id=station_id,
+        power=power,
+        energy_month=energy_month,
+        energy_today=energy_today,
+        grid_voltage=grid_voltage,
+        info=info,
+        panels=panels,
+    )
@@ -1,10 +1,25 @@
 """Easy PV."""
 
+import asyncio
 import logging
-from datetime import UTC, datetime
-from typing import Any
+from collections.abc import AsyncIterator, Mapping
+from datetime import UTC, datetime, timedelta
+from typing import Any, Self
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector, hdrs
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from .month_cache import MonthCache
+from .throttling import (
+    HTTP_TOO_MANY_REQUESTS,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
 
 LOG = logging.getLogger(__name__)
 BASE_URL = "https://inverter-en.easycharging-tech.com/prod-api"
@@ -17,6 +32,53 @@ HEADERS = {
 }
 
 HTTP_OK = 200
+HTTP_UNAUTHORIZED = 401
+
+DEFAULT_CONNECTOR_LIMIT = 10
+DEFAULT_DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75
+
+PATH_LOGIN = "/api/sys/v2/passLogin"
+PATH_USER_INFO = "/api/user/v2/selectUserInfo"
+PATH_STATIONS = "/api/powerStation/v3/getStationList"
+PATH_STATION_DEVICES = "/api/powerStation/v2/getPowerList"
+PATH_DEVICE_DATA = "/api/powerStation/v3/getDeviceDataInfo"
+
+# Seconds a request may take including throttling and retries
+REQUEST_TIMEOUT = 30.0
+
+# Seconds responses of identical requests are reused by default, 0 to disable
+DEFAULT_CACHE_TTL = 0.0
+
+# Requests per second and burst size of the global rate limit
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_RATE_BURST = 40
+
+# Stations per page of the station list
+STATIONS_PAGE_SIZE = 200
+
+# Maximum concurrent requests per endpoint
+DEFAULT_ENDPOINT_LIMIT = 4
+ENDPOINT_LIMITS: Mapping[str, int] = {
+    PATH_STATIONS: 2,
+    PATH_DEVICE_DATA: 8,
+}
+
+
+type _RequestKey = tuple[str, str | None, tuple[tuple[str, Any], ...]]
+
+
+def _discard_result(task: asyncio.Task[Any]) -> None:
+    """Retrieve the result of a shared request nobody waits for anymore."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _is_past_month(month: str) -> bool:
+    """Check if a month ("YYYY-MM") is over, so its data no longer changes."""
+    # A day of margin covers the time zones of the cloud and the caller.
+    latest = datetime.now(tz=UTC) - timedelta(days=1)
+    return month < f"{latest.year}-{latest.month:02d}"
 
 
 class BaseError(Exception):
@@ -39,12 +101,43 @@ class LoginError(ApiError):
         super().__init__("Login failed", code, msg)
 
 
+class NoDataError(ApiError):
+    """Error raised if the cloud has no data for a request."""
+
+
 class InvalidResponseError(BaseError):
     """Error raised for invalid responses from the API."""
 
-    def __init__(self) -> None:
-        """Initialize the InvalidResponseError."""
-        super().__init__("Invalid response from API")
+    def __init__(self, details: str | None = None) -> None:
+        """Initialize the InvalidResponseError with optional details."""
+        message = "Invalid response from API"
+        super().__init__(f"{message}: {details}" if details else message)
+
+
+def _decode_json(body: bytes) -> Any:
+    """Decode a response body, raising `InvalidResponseError` if it is not JSON."""
+    try:
+        return json_loads(body)
+    except ValueError as err:
+        raise InvalidResponseError("body is not JSON") from err
+
+
+def _envelope(data: Any) -> tuple[Any, Any, Any]:
+    """
+    Split a decoded response into its code, data and message.
+
+    Raises `LoginError` if the token was rejected, so callers can tell it apart
+    from errors of a single request.
+    """
+    try:
+        code, result, msg = data["code"], data.get("data"), data.get("msg")
+    except (AttributeError, KeyError, TypeError) as err:
+        raise InvalidResponseError("response without code") from err
+
+    if code == HTTP_UNAUTHORIZED:
+        raise LoginError(code, msg)
+
+    return code, result, msg
 
 
 class EasyPVClient:
@@ -52,11 +145,68 @@ class EasyPVClient:
     Client for interacting with the Easy PV API.
 
     Provides methods for authentication and retrieving station and device data.
+
+    All requests share a single pooled session. A session can be passed in (e.g.
+    the shared Home Assistant session), otherwise the client creates its own on
+    first use and closes it again in `close`.
+
+    Requests go through a global token bucket (`rate_limit` requests per second,
+    None to disable) and a concurrency cap per endpoint. Throttled (429) and
+    failed (5xx) requests are retried with exponential backoff and jitter,
+    honouring `Retry-After`.
+
+    Every method takes an optional `deadline` in event loop time (see
+    `loop.time()`), so callers can pass down what is left of their own budget.
+    Requests take at most `REQUEST_TIMEOUT` seconds either way, including
+    throttling, retries and reading the response. A retry that would start after
+    the deadline is not attempted.
+
+    Concurrent identical GET requests share a single request and its response.
+    With `cache_ttl` set, the response is also reused for that many seconds.
+
+    Device data of past months is final, with a `month_cache` it is only fetched
+    once and read from disk afterwards.
     """
 
-    def __init__(self) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        session: ClientSession | None = None,
+        *,
+        base_url: str = BASE_URL,
+        connector_limit: int = DEFAULT_CONNECTOR_LIMIT,
+        dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+        rate_limit: float | None = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+        endpoint_limits: Mapping[str, int] = ENDPOINT_LIMITS,
+        retry_policy: RetryPolicy | None = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        month_cache: MonthCache | None = None,
+    ) -> None:
         """Initialize the EasyPVClient instance."""
         self._token: str | None = None
+        self._base_url = base_url
+        self._session = session
+        self._owns_session = session is None
+        self._connector_limit = connector_limit
+        self._dns_cache_ttl = dns_cache_ttl
+        self._rate_limit = (
+            TokenBucket(rate_limit, rate_burst) if rate_limit is not None else None
+        )
+        self._endpoint_limits = dict(endpoint_limits)
+        self._endpoint_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._cache_ttl = cache_ttl
+        self._cache: dict[_RequestKey, tuple[float, bytes]] = {}
+        self._in_flight: dict[_RequestKey, asyncio.Task[bytes]] = {}
+        self._month_cache = month_cache
+
+    async def __aenter__(self) -> Self:
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Exit the async context manager and release the session."""
+        await self.close()
 
     @property
     def token(self) -> str | None:
@@ -68,113 +218,402 @@ class EasyPVClient:
         """Check if the client is logged in."""
         return self._token is not None
 
-    async def login_with_password(self, username: str, password: str) -> None:
+    def _get_session(self) -> ClientSession:
+        """Return the pooled session, creating it if needed."""
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=self._connector_limit,
+                    ttl_dns_cache=self._dns_cache_ttl,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                )
+            )
+            self._owns_session = True
+
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if it is owned by this client."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request_raw(
+        self,
+        method: str,
+        path: str,
+        *,
+        authenticated: bool = True,
+        deadline: float | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        """Send a request and return the raw body."""
+        now = asyncio.get_running_loop().time()
+        when = now + REQUEST_TIMEOUT
+        if deadline is not None:
+            when = min(when, deadline)
+
+        key = self._request_key(method, path, authenticated=authenticated, **kwargs)
+        if key is None:
+            async with asyncio.timeout_at(when):
+                return await self._send(
+                    method, path, when, authenticated=authenticated, **kwargs
+                )
+
+        cached = self._cached(key, now)
+        if cached is not None:
+            return cached
+
+        # The shared request gets the full timeout, callers may have longer
+        # deadlines than the one that started it and each enforces its own.
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.create_task(
+                self._send_shared(
+                    key,
+                    method,
+                    path,
+                    now + REQUEST_TIMEOUT,
+                    authenticated=authenticated,
+                    **kwargs,
+                )
+            )
+            task.add_done_callback(_discard_result)
+
+        # Callers that give up do not cancel the request for the others.
+        async with asyncio.timeout_at(when):
+            return await asyncio.shield(task)
+
+    def _request_key(
+        self, method: str, path: str, *, authenticated: bool, **kwargs: Any
+    ) -> _RequestKey | None:
+        """Return the key identical requests share, None if they cannot be shared."""
+        if method != "GET" or kwargs.keys() - {"params"}:
+            return None
+
+        return (
+            path,
+            self._token if authenticated else None,
+            tuple(sorted((kwargs.get("params") or {}).items())),
+        )
+
+    def _cached(self, key: _RequestKey, now: float) -> bytes | None:
+        """Return a cached response that has not expired yet."""
+        # Entries are kept in the order they expire in.
+        while self._cache:
+            oldest = next(iter(self._cache))
+            if self._cache[oldest][0] > now:
+                break
+            del self._cache[oldest]
+
+        entry = self._cache.get(key)
+        return entry[1] if entry is not None else None
+
+    async def _send_shared(
+        self,
+        key: _RequestKey,
+        method: str,
+        path: str,
+        deadline: float,
+        *,
+        authenticated: bool,
+        **kwargs: Any,
+    ) -> bytes:
+        """Send a request shared by all identical requests while it is in flight."""
+        try:
+            async with asyncio.timeout_at(deadline):
+                body = await self._send(
+                    method, path, deadline, authenticated=authenticated, **kwargs
+                )
+        finally:
+            del self._in_flight[key]
+
+        if self._cache_ttl > 0:
+            self._cache.pop(key, None)
+            self._cache[key] = (
+                asyncio.get_running_loop().time() + self._cache_ttl,
+                body,
+            )
+
+        return body
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        deadline: float,
+        *,
+        authenticated: bool,
+        **kwargs: Any,
+    ) -> bytes:
+        """Send a request, retrying it while the deadline allows."""
+        headers = (
+            {**HEADERS, "Authorization": f"Bearer {self._token}"}
+            if authenticated
+            else HEADERS
+        )
+
+        endpoint_limit = self._endpoint_semaphore(path)
+        attempt = 0
+        while True:
+            async with endpoint_limit:
+                if self._rate_limit is not None:
+                    await self._rate_limit.acquire()
+
+                async with self._get_session().request(
+                    method, f"{self._base_url}{path}", headers=headers, **kwargs
+                ) as response:
+                    if response.status == HTTP_OK:
+                        return await response.read()
+                    if response.status == HTTP_UNAUTHORIZED:
+                        raise LoginError(response.status, response.reason or "")
+
+                    status = response.status
+                    retry_after = parse_retry_after(
+                        response.headers.get(hdrs.RETRY_AFTER)
+                    )
+
+            attempt += 1
+            if (
+                not self._retry_policy.should_retry(status)
+                or attempt >= self._retry_policy.attempts
+            ):
+                raise InvalidResponseError
+
+            delay = self._retry_policy.delay(attempt - 1, retry_after)
+            if asyncio.get_running_loop().time() + delay >= deadline:
+                raise InvalidResponseError
+
+            # Throttling applies to the whole account, so hold back all requests.
+            if status == HTTP_TOO_MANY_REQUESTS and self._rate_limit is not None:
+                self._rate_limit.pause(delay)
+
+            LOG.debug("Retrying %s %s in %.1fs after %d", method, path, delay, status)
+            await asyncio.sleep(delay)
+
+    def _endpoint_semaphore(self, path: str) -> asyncio.Semaphore:
+        """Return the semaphore capping the concurrent requests to an endpoint."""
+        semaphore = self._endpoint_semaphores.get(path)
+        if semaphore is None:
+            semaphore = self._endpoint_semaphores[path] = asyncio.Semaphore(
+                self._endpoint_limits.get(path, DEFAULT_ENDPOINT_LIMIT)
+            )
+
+        return semaphore
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        authenticated: bool = True,
+        deadline: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request and return the decoded JSON body."""
+        return _decode_json(
+            await self._request_raw(
+                method, path, authenticated=authenticated, deadline=deadline, **kwargs
+            )
+        )
+
+    async def login_with_password(
+        self,
+        username: str,
+        password: str,
+        *,
+        deadline: float | None = None,
+    ) -> None:
         """Login to the Easy PV service."""
-        async with (
-            ClientSession() as session,
-            session.post(
-                f"{BASE_URL}/api/sys/v2/passLogin",
-                json={"num": username, "password": password},
-                headers=HEADERS,
-            ) as response,
-        ):
-            if response.status == HTTP_OK:
-                data = await response.json()
-                if data["code"] == HTTP_OK and data["data"]["token"]:
-                    self._token = data["data"]["token"]
-                    return
-
-                raise LoginError(data["code"], data["msg"])
-
-            raise InvalidResponseError
-
-    async def login_with_token(self, token: str) -> None:
+        data = await self._request(
+            "POST",
+            PATH_LOGIN,
+            json={"num": username, "password": password},
+            authenticated=False,
+            deadline=deadline,
+        )
+        if data["code"] == HTTP_OK and data["data"]["token"]:
+            self._token = data["data"]["token"]
+            return
+
+        raise LoginError(data["code"], data["msg"])
+
+    async def login_with_token(
+        self, token: str, *, deadline: float | None = None
+    ) -> None:
         """Login to the Easy PV service using a token."""
         try:
             self._token = token
-            await self.get_user_info()
+            await self.get_user_info(deadline=deadline)
         except:
             self._token = None
             raise
 
+    def use_token(self, token: str) -> None:
+        """
+        Use a previously issued token without checking it first.
+
+        Requests fail with `LoginError` if the token is no longer valid.
+        """
+        self._token = token
+
     def logout(self) -> None:
         """Log out from the Easy PV service."""
         self._token = None
 
-    async def get_user_info(self) -> Any:
+    async def get_user_info(self, *, deadline: float | None = None) -> Any:
         """Get the user information if logged in."""
-        async with (
-            ClientSession() as session,
-            session.get(
-                f"{BASE_URL}/api/user/v2/selectUserInfo",
-                headers={**HEADERS, "Authorization": f"Bearer {self._token}"},
-            ) as response,
-        ):
-            if response.status == HTTP_OK:
-                data = await response.json()
-                if data["code"] == HTTP_OK and data["data"]:
-                    return data["data"]
-
-                raise LoginError(data["code"], data["msg"])
-
-            raise InvalidResponseError
-
-    async def get_stations(self) -> list[Any]:
-        """Get the list of stations."""
-        async with (
-            ClientSession() as session,
-            session.get(
-                f"{BASE_URL}/api/powerStation/v3/getStationList?pageNum=1&pageSize=1000",
-                headers={**HEADERS, "Authorization": f"Bearer {self._token}"},
-            ) as response,
-        ):
-            if response.status == HTTP_OK:
-                data = await response.json()
-                if data["code"] == HTTP_OK and data["data"]["rows"]:
-                    return data["data"]["rows"]
-
-                raise ApiError("Failed to get stations", data["code"], data["msg"])
-
-            raise InvalidResponseError
-
-    async def get_station_devices(self, station_id: str) -> list[Any]:
-        """Get the devices of a station."""
-        async with (
-            ClientSession() as session,
-            session.get(
-                f"{BASE_URL}/api/powerStation/v2/getPowerList?powerId={station_id}",
-                headers={**HEADERS, "Authorization": f"Bearer {self._token}"},
-            ) as response,
-        ):
-            if response.status == HTTP_OK:
-                data = await response.json()
-                if data["code"] == HTTP_OK and data["data"]:
-                    return data["data"]
-
-                raise ApiError("Failed to get devices", data["code"], data["msg"])
-
-            raise InvalidResponseError
+        data = await self._request("GET", PATH_USER_INFO, deadline=deadline)
+        if data["code"] == HTTP_OK and data["data"]:
+            return data["data"]
+
+        raise LoginError(data["code"], data["msg"])
+
+    async def _get_stations_page(
+        self, page: int, page_size: int, deadline: float | None
+    ) -> tuple[list[Any], int | None]:
+        """Get a page of the station list and the total number of stations."""
+        data = await self._request(
+            "GET",
+            PATH_STATIONS,
+            params={"pageNum": page, "pageSize": page_size},
+            deadline=deadline,
+        )
+        code, result, msg = _envelope(data)
+        if code != HTTP_OK:
+            raise ApiError("Failed to get stations", code, msg)
 
-    async def get_device_data(
-        self, station_id: str, device_id: str, date: str | None = None
-    ) -> dict[str, Any]:
-        """Get the data of a specific device."""
+        try:
+            return result["rows"] or [], result.get("total")
+        except (AttributeError, KeyError, TypeError) as err:
+            raise InvalidResponseError("station list without rows") from err
+
+    async def iter_stations(
+        self, *, page_size: int = STATIONS_PAGE_SIZE, deadline: float | None = None
+    ) -> AsyncIterator[Any]:
+        """
+        Yield all stations as their pages arrive.
+
+        The first page tells the total number of stations, the remaining pages
+        are then fetched concurrently and yielded in the order they complete.
+        Without a total, pages are fetched one after another until a short page.
+        """
+        rows, total = await self._get_stations_page(1, page_size, deadline)
+        if not rows:
+            raise ApiError("Failed to get stations", HTTP_OK, "No stations")
+
+        for row in rows:
+            yield row
+
+        if total is None:
+            page = 1
+            while len(rows) == page_size:
+                page += 1
+                rows, _ = await self._get_stations_page(page, page_size, deadline)
+                for row in rows:
+                    yield row
+            return
+
+        pages = -(-total // page_size)
+        tasks = [
+            asyncio.create_task(self._get_stations_page(page, page_size, deadline))
+            for page in range(2, pages + 1)
+        ]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                rows, _ = await next_page
+                for row in rows:
+                    yield row
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_stations(self, *, deadline: float | None = None) -> list[Any]:
+        """Get the list of all stations."""
+        return [station async for station in self.iter_stations(deadline=deadline)]
+
+    async def get_station_devices(
+        self, station_id: str, *, deadline: float | None = None
+    ) -> list[Any]:
+        """Get the devices of a station."""
+        data = await self._request(
+            "GET",
+            PATH_STATION_DEVICES,
+            params={"powerId": station_id},
+            deadline=deadline,
+        )
+        code, result, msg = _envelope(data)
+        if code == HTTP_OK and result:
+            return result
+
+        raise ApiError("Failed to get devices", code, msg)
+
+    async def get_device_payload(
+        self,
+        station_id: str,
+        device_id: str,
+        date: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> bytes:
+        """
+        Get the raw response for the data of a specific device.
+
+        Use `parse_device_payload` to decode it.
+        """
         if not date:
             now = datetime.now(tz=UTC)
             date = f"{now.year}-{now.month:02d}"
 
-        async with (
-            ClientSession() as session,
-            session.get(
-                f"{BASE_URL}/api/powerStation/v3/getDeviceDataInfo?deviceId={device_id}&stationId={station_id}&date={date}",
-                headers={**HEADERS, "Authorization": f"Bearer {self._token}"},
-            ) as response,
-        ):
-            if response.status == HTTP_OK:
-                data = await response.json()
-                if data["code"] == HTTP_OK and data["data"]:
-                    return data["data"]
-
-                raise ApiError("Failed to get device data", data["code"], data["msg"])
-
-            raise InvalidResponseError
+        month_cache = self._month_cache if _is_past_month(date) else None
+        if month_cache is not None:
+            cached = await month_cache.get(station_id, device_id, date)
+            if cached is not None:
+                return cached
+
+        payload = await self._request_raw(
+            "GET",
+            PATH_DEVICE_DATA,
+            params={"deviceId": device_id, "stationId": station_id, "date": date},
+            deadline=deadline,
+        )
+
+        if month_cache is not None:
+            try:
+                self.parse_device_payload(payload)
+            except BaseError:
+                return payload
+
+            await month_cache.put(station_id, device_id, date, payload)
+
+        return payload
+
+    @staticmethod
+    def parse_device_payload(payload: bytes) -> dict[str, Any]:
+        """Decode a raw response returned by `get_device_payload`."""
+        code, result, msg = _envelope(_decode_json(payload))
+        if code == HTTP_OK and result:
+            if not isinstance(result, dict):
+                raise InvalidResponseError("device data is not an object")
+            return result
+        if code == HTTP_OK:
+            # E.g. months before the device was installed
+            raise NoDataError("Failed to get device data", code, msg)
+
+        raise ApiError("Failed to get device data", code, msg)
+
+    async def get_device_data(
+        self,
+        station_id: str,
+        device_id: str,
+        date: str | None = None,
+        *,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """Get the data of a specific device."""
+        return self.parse_device_payload(
+            await self.get_device_payload(
+                station_id, device_id, date, deadline=deadline
+            )
+        )
@@ -0,0 +1,128 @@
+"""Persistent cache for device data of past months."""
+
+import asyncio
+import logging
+import os
+import shutil
+import zlib
+from collections import OrderedDict
+from functools import partial
+from hashlib import blake2b
+from pathlib import Path
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+SUFFIX = ".z"
+
+
+class MonthCache:
+    """
+    Size-bounded LRU cache of device data responses on disk.
+
+    Data of past months does not change anymore, so it never expires. Every
+    entry is a zlib-compressed response in its own file named after a hash of
+    station, device and month. The least recently used entries are removed once
+    the files exceed `max_bytes`. File access runs in the default executor.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize the cache, files are only read on first use."""
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._size = 0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _name(station_id: str, device_id: str, month: str) -> str:
+        key = f"{station_id}\0{device_id}\0{month}".encode()
+        return blake2b(key, digest_size=16).hexdigest() + SUFFIX
+
+    def _scan(self) -> OrderedDict[str, int]:
+        """Index the files on disk from least to most recently used."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        files = [
+            (entry.stat().st_mtime, entry.name, entry.stat().st_size)
+            for entry in os.scandir(self._directory)
+            if entry.name.endswith(SUFFIX)
+        ]
+        return OrderedDict((name, size) for _, name, size in sorted(files))
+
+    async def _index(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            async with self._lock:
+                if self._entries is None:
+                    entries = await asyncio.get_running_loop().run_in_executor(
+                        None, self._scan
+                    )
+                    self._size = sum(entries.values())
+                    self._entries = entries
+
+        return self._entries
+
+    def _read(self, name: str) -> bytes:
+        path = self._directory / name
+        data = zlib.decompress(path.read_bytes())
+        os.utime(path)
+        return data
+
+    def _write(self, name: str, data: bytes, evicted: list[str]) -> None:
+        path = self._directory / name
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        for victim in evicted:
+            (self._directory / victim).unlink(missing_ok=True)
+
+    async def get(self, station_id: str, device_id: str, month: str) -> bytes | None:
+        """Return the cached response for a month, None if it is not cached."""
+        entries = await self._index()
+        name = self._name(station_id, device_id, month)
+        if name not in entries:
+            return None
+
+        entries.move_to_end(name)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._read, name
+            )
+        except (OSError, zlib.error):
+            LOG.debug("Dropping unreadable cache entry %s", name)
+            self._size -= entries.pop(name, 0)
+            return None
+
+    async def put(
+        self, station_id: str, device_id: str, month: str, payload: bytes
+    ) -> None:
+        """Store the response for a month, evicting old entries if needed."""
+        entries = await self._index()
+        name = self._name(station_id, device_id, month)
+        data = zlib.compress(payload, 9)
+
+        self._size += len(data) - entries.pop(name, 0)
+        entries[name] = len(data)
+        evicted: list[str] = []
+        while self._size > self._max_bytes and len(entries) > 1:
+            victim, size = entries.popitem(last=False)
+            self._size -= size
+            evicted.append(victim)
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, name, data, evicted
+            )
+        except OSError:
+            LOG.warning("Failed to write cache entry %s", name, exc_info=True)
+            self._size -= entries.pop(name, 0)
+
+    async def clear(self) -> None:
+        """Remove all entries and the cache directory."""
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(
+                None, partial(shutil.rmtree, self._directory, ignore_errors=True)
+            )
+            self._entries = None
+            self._size = 0
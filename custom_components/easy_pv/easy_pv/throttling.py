@@ -0,0 +1,96 @@
+"""Rate limiting and retries for the Easy PV client."""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from time import monotonic
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+
+class TokenBucket:
+    """
+    Global rate limit for requests.
+
+    Tokens refill at `rate` per second up to `capacity`, each request takes one.
+    Waiting requests are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause(self, delay: float) -> None:
+        """Hold back all requests for `delay` seconds."""
+        self._paused_until = max(self._paused_until, monotonic() + delay)
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter for throttled and failed requests."""
+
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    @staticmethod
+    def should_retry(status: int) -> bool:
+        """Check if a request with the given response status may be retried."""
+        return status == HTTP_TOO_MANY_REQUESTS or status >= HTTP_SERVER_ERROR
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the delay in seconds before retrying a failed attempt."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        return random.uniform(  # noqa: S311
+            0, min(self.max_delay, self.base_delay * 2**attempt)
+        )
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=UTC)
+
+    return max(0.0, (date - datetime.now(tz=UTC)).total_seconds())
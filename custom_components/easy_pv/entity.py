@@ -1,6 +1,6 @@
 """Entity representations for the Easy PV integration."""
 
-from typing import Generic, TypeVar
+from typing import Generic, TypeVar, cast
 
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -8,7 +8,14 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import EasyPVCoordinator
-from .model import PVDevice, PVEntity, PVPanel, PVStation
+from .model import (
+    PVDevice,
+    PVPanel,
+    PVStation,
+    device_key,
+    panel_key,
+    station_key,
+)
 
 T = TypeVar("T")
 
@@ -16,21 +23,19 @@ T = TypeVar("T")
 class EasyPVEntity(CoordinatorEntity[EasyPVCoordinator], Generic[T]):
     """Base representation of a Hello World Sensor."""
 
-    def __init__(self, coordinator: EasyPVCoordinator) -> None:
+    def __init__(self, coordinator: EasyPVCoordinator, key: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-
-    @property
-    def _data(self) -> T | None:
-        raise NotImplementedError("_data not implemented in subclasses")
-
-    @property
-    def _id(self) -> str | None:
-        return self._data.entity_id if isinstance(self._data, PVEntity) else None
-
-    @property
-    def _name(self) -> str | None:
-        return self._data.entity_name if isinstance(self._data, PVEntity) else None
+        super().__init__(coordinator, context=key)
+        self._key = key
+        self._last_state: object = None
+        self._resolve_data()
+
+    def _resolve_data(self) -> None:
+        """Look up the data of this entity in the coordinator."""
+        data = self.coordinator.get_entity_data(self._key)
+        self._data = cast("T | None", data)
+        self._id = data.entity_id if data else None
+        self._name = data.entity_name if data else None
 
     @property
     def _device_info(self) -> DeviceInfo | None:
@@ -51,24 +56,42 @@ class EasyPVEntity(CoordinatorEntity[EasyPVCoordinator], Generic[T]):
     @property
     def available(self) -> bool:  # type: ignore[override]
         """Return True if roller and hub is available."""
-        return self.coordinator.is_logged_in
+        return self.coordinator.is_logged_in and not self.coordinator.is_stale(
+            self._key
+        )
 
     def _handle_update(self) -> None:
         pass
 
+    def _state_key(self) -> object:
+        """Return what this entity writes to the state machine."""
+        return (self.available, self.state, self.state_attributes)
+
+    def _state_changed(self) -> bool:
+        """Check if the state has changed since it was last written."""
+        state = self._state_key()
+        if state == self._last_state:
+            return False
+
+        self._last_state = state
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the initial state when added to hass."""
+        await super().async_added_to_hass()
+        self._state_changed()
+
     @callback
     def _handle_coordinator_update(self) -> None:
+        self._resolve_data()
         self._handle_update()
-        self.async_write_ha_state()
+        if self._state_changed():
+            self.async_write_ha_state()
 
 
 class EasyPVStationEntity(EasyPVEntity[PVStation]):
     """Representation of a PV station entity."""
 
-    @property
-    def _data(self) -> PVStation | None:
-        return self.coordinator.get_station(self._station_id)
-
     def __init__(
         self,
         coordinator: EasyPVCoordinator,
@@ -77,16 +100,12 @@ class EasyPVStationEntity(EasyPVEntity[PVStation]):
         """Initialize the sensor."""
         self._station_id = station_id
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, station_key(station_id))
 
 
 class EasyPVDeviceEntity(EasyPVEntity[PVDevice]):
     """Representation of a PV device entity."""
 
-    @property
-    def _data(self) -> PVDevice | None:
-        return self.coordinator.get_device(self._station_id, self._device_id)
-
     @property
     def _device_info(self) -> DeviceInfo | None:
         if not self._data:
@@ -94,9 +113,9 @@ class EasyPVDeviceEntity(EasyPVEntity[PVDevice]):
 
         return DeviceInfo(
             manufacturer="Electronic Way Technology",
-            model=self._data.product_code,
-            serial_number=self._data.device_serial,
-            sw_version=self._data.app_fw,
+            model=self._data.info.product_code,
+            serial_number=self._data.info.device_serial,
+            sw_version=self._data.info.app_fw,
             via_device=(DOMAIN, self._station_id),
         )
 
@@ -110,36 +129,28 @@ class EasyPVDeviceEntity(EasyPVEntity[PVDevice]):
         self._station_id = station_id
         self._device_id = device_id
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, device_key(station_id, device_id))
 
 
 class EasyPVPanelEntity(EasyPVEntity[PVPanel]):
     """Representation of a PV panel entity."""
 
-    @property
-    def _data(self) -> PVPanel | None:
-        return self.coordinator.get_panel(
-            self._station_id, self._device_id, self._panel_number
-        )
-
     @property
     def _device_info(self) -> DeviceInfo | None:
         if not self._data:
             return None
 
-        parent = self.coordinator.get_device(self._station_id, self._device_id)
-
-        return (
-            DeviceInfo(
-                translation_key="panel",
-                translation_placeholders={
-                    "connected_inverter": parent.entity_name if parent else "",
-                    "panel_number": str(self._panel_number + 1),
-                },
-                via_device=(DOMAIN, f"{self._station_id}_{self._device_id}"),
-            )
-            if self._data
-            else None
+        parent = self.coordinator.get_entity_data(
+            device_key(self._station_id, self._device_id)
+        )
+
+        return DeviceInfo(
+            translation_key="panel",
+            translation_placeholders={
+                "connected_inverter": parent.entity_name if parent else "",
+                "panel_number": str(self._panel_number + 1),
+            },
+            via_device=(DOMAIN, device_key(self._station_id, self._device_id)),
         )
 
     def __init__(
@@ -154,4 +165,4 @@ class EasyPVPanelEntity(EasyPVEntity[PVPanel]):
         self._device_id = device_id
         self._panel_number = panel_number
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, panel_key(station_id, device_id, panel_number))
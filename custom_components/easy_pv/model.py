@@ -3,7 +3,22 @@
 from dataclasses import dataclass
 
 
-@dataclass
+def station_key(station_id: str) -> str:
+    """Return the entity key of a station."""
+    return station_id
+
+
+def device_key(station_id: str, device_id: str) -> str:
+    """Return the entity key of a device."""
+    return f"{station_id}_{device_id}"
+
+
+def panel_key(station_id: str, device_id: str, panel_number: int) -> str:
+    """Return the entity key of a panel by its zero based index."""
+    return f"{station_id}_{device_id}_panel_{panel_number + 1}"
+
+
+@dataclass(frozen=True, slots=True)
 class PVEntity:
     """Base Data class for a PV entities."""
 
@@ -11,7 +26,7 @@ class PVEntity:
     entity_name: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PVPanel(PVEntity):
     """Data class for a PV panel."""
 
@@ -23,7 +38,17 @@ class PVPanel(PVEntity):
     voltage: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class PVDeviceInfo:
+    """Data class for the static metadata of a PV inverter."""
+
+    product_code: str
+    device_serial: str
+    app_fw: str
+    net_fw: str
+
+
+@dataclass(frozen=True, slots=True)
 class PVDevice(PVEntity):
     """Data class for a PV inverter."""
 
@@ -32,16 +57,13 @@ class PVDevice(PVEntity):
     power: float
     energy_month: float
     energy_today: float
-    product_code: str
-    device_serial: str
     grid_voltage: float
-    app_fw: str
-    net_fw: str
 
-    panels: list[PVPanel]
+    info: PVDeviceInfo
+    panels: tuple[PVPanel, ...]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PVStation(PVEntity):
     """Data class for a PV station."""
 
@@ -49,10 +71,57 @@ class PVStation(PVEntity):
     name: str
     address: str
     location: str
-    latitude: float
-    longitude: float
+    latitude: float | None
+    longitude: float | None
     power: float
     energy_total: float
     energy_today: float
 
     devices: dict[str, PVDevice]
+
+
+@dataclass(frozen=True, slots=True)
+class PVStationTopology:
+    """Data class for the static layout of a PV station."""
+
+    id: str
+    name: str
+    address: str
+    location: str
+    latitude: float | None
+    longitude: float | None
+    energy_total: float
+    energy_today: float
+
+    device_ids: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class TopologyDiff:
+    """Data class for the stations, devices and panels added or removed."""
+
+    added_stations: tuple[PVStation, ...] = ()
+    added_devices: tuple[PVDevice, ...] = ()
+    added_panels: tuple[PVPanel, ...] = ()
+    removed: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class PanelAggregates:
+    """Data class for aggregates over the panels of a device."""
+
+    count: int
+    power_total: float
+    power_min: float
+    power_max: float
+    voltage_min: float
+    voltage_max: float
+    current_total: float
+
+    @property
+    def imbalance(self) -> float | None:
+        """Return the spread of the panel power in percent of the strongest panel."""
+        if self.count <= 1 or self.power_max <= 0:
+            return None
+
+        return (self.power_max - self.power_min) / self.power_max * 100
@@ -0,0 +1,172 @@
+"""Adaptive polling for the Easy PV integration."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import StrEnum
+
+from astral import Observer
+from astral.sun import elevation
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_PROBE_DELAY,
+    BREAKER_PROBE_MAX_DELAY,
+    IDLE_DEVICE_CYCLES,
+    IDLE_DEVICE_PROBE_INTERVAL,
+    NIGHT_SUN_ELEVATION,
+    POLL_INTERVAL_DAY,
+    POLL_INTERVAL_NIGHT,
+    POLL_INTERVAL_RAMP,
+    RAMP_POWER_CHANGE,
+    RAMP_SUN_ELEVATION,
+)
+from .model import PVDevice, PVStation, PVStationTopology
+
+
+def _sun_elevation(
+    station: PVStation | PVStationTopology, now: datetime
+) -> float | None:
+    """Return the sun elevation at a station, None if its location is unknown."""
+    if station.latitude is None or station.longitude is None:
+        return None
+
+    return elevation(Observer(station.latitude, station.longitude), now)
+
+
+@dataclass
+class _DeviceState:
+    """Polling state of a single device."""
+
+    zero_cycles: int = 0
+    last_polled: datetime | None = None
+
+
+@dataclass
+class AdaptivePollScheduler:
+    """
+    Chooses the polling interval and which devices have to be polled.
+
+    The interval depends on the sun elevation at the stations, the current output
+    and how fast the output changes. At night, devices that kept reporting no
+    output are only probed occasionally.
+    """
+
+    _devices: dict[str, _DeviceState] = field(default_factory=dict)
+    _last_power: float | None = None
+
+    def is_night(self, station: PVStation | PVStationTopology, now: datetime) -> bool:
+        """Check if it is night at a station, False if its location is unknown."""
+        sun_elevation = _sun_elevation(station, now)
+        return sun_elevation is not None and sun_elevation < NIGHT_SUN_ELEVATION
+
+    def should_poll(self, device_key: str, now: datetime, *, night: bool) -> bool:
+        """
+        Check if a device has to be polled in this cycle.
+
+        Idle devices are only skipped at night, by day they may start producing
+        any moment and are polled like all others.
+        """
+        state = self._devices.get(device_key)
+        if not night or state is None or state.last_polled is None:
+            return True
+
+        if state.zero_cycles < IDLE_DEVICE_CYCLES:
+            return True
+
+        return now - state.last_polled >= IDLE_DEVICE_PROBE_INTERVAL
+
+    def record_device(self, device: PVDevice, now: datetime) -> None:
+        """Record the data of a freshly polled device."""
+        state = self._devices.setdefault(device.entity_id, _DeviceState())
+        state.last_polled = now
+        state.zero_cycles = state.zero_cycles + 1 if not device.power else 0
+
+    def next_interval(self, stations: dict[str, PVStation], now: datetime) -> timedelta:
+        """Return the interval until the next refresh."""
+        power = sum(station.power for station in stations.values())
+        last_power, self._last_power = self._last_power, power
+
+        # Stations without a location do not tell anything about the sun.
+        sun_elevation = max(
+            (
+                station_elevation
+                for station in stations.values()
+                if (station_elevation := _sun_elevation(station, now)) is not None
+            ),
+            default=None,
+        )
+
+        if sun_elevation is None:
+            return POLL_INTERVAL_DAY
+
+        if sun_elevation < NIGHT_SUN_ELEVATION and not power:
+            return POLL_INTERVAL_NIGHT
+
+        if sun_elevation < RAMP_SUN_ELEVATION:
+            return POLL_INTERVAL_RAMP
+
+        change = abs(power - last_power) if last_power is not None else 0.0
+        if change > RAMP_POWER_CHANGE * max(last_power or 0.0, 1.0):
+            return POLL_INTERVAL_RAMP
+
+        return POLL_INTERVAL_DAY
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker of a device."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class _BreakerState:
+    """Failures of a single device."""
+
+    failures: int = 0
+    probe_at: datetime | None = None
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Stops polling devices that keep failing.
+
+    After `BREAKER_FAILURE_THRESHOLD` consecutive failures the breaker of a device
+    opens and the device is only probed again after a delay, which doubles with
+    every failed probe. A successful request closes the breaker again.
+    """
+
+    _devices: dict[str, _BreakerState] = field(default_factory=dict)
+
+    def state(self, device_key: str, now: datetime) -> BreakerState:
+        """Return the breaker state of a device."""
+        breaker = self._devices.get(device_key)
+        if breaker is None or breaker.probe_at is None:
+            return BreakerState.CLOSED
+
+        return BreakerState.OPEN if now < breaker.probe_at else BreakerState.HALF_OPEN
+
+    def allow(self, device_key: str, now: datetime) -> bool:
+        """Check if a device may be polled in this cycle."""
+        return self.state(device_key, now) != BreakerState.OPEN
+
+    def record_success(self, device_key: str) -> None:
+        """Record a successful request of a device."""
+        self._devices.pop(device_key, None)
+
+    def record_failure(self, device_key: str, now: datetime) -> None:
+        """Record a failed request of a device."""
+        breaker = self._devices.setdefault(device_key, _BreakerState())
+        breaker.failures += 1
+        if breaker.failures >= BREAKER_FAILURE_THRESHOLD:
+            # The exponent is capped so long outages cannot overflow timedelta.
+            probes = min(breaker.failures - BREAKER_FAILURE_THRESHOLD, 10)
+            breaker.probe_at = now + min(
+                BREAKER_PROBE_DELAY * 2**probes, BREAKER_PROBE_MAX_DELAY
+            )
+
+    def forget(self, device_key: str) -> None:
+        """Forget a device that no longer exists."""
+        self._devices.pop(device_key, None)
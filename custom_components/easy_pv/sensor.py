@@ -1,45 +1,69 @@
 """Sensor platform for EasyPV integration."""
 
 import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from time import monotonic
+from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from . import EasyPVConfigEntry
+from .const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_HEARTBEAT,
+    CONF_DEADBAND_RELATIVE,
+    DEFAULT_DEADBAND_HEARTBEAT,
+)
 from .coordinator import EasyPVCoordinator
-from .entity import EasyPVDeviceEntity, EasyPVPanelEntity, EasyPVStationEntity
+from .entity import (
+    EasyPVDeviceEntity,
+    EasyPVEntity,
+    EasyPVPanelEntity,
+    EasyPVStationEntity,
+)
+from .scheduler import BreakerState
 from .utils import setup_platform_entry
 
 LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,
+    _: HomeAssistant,
     config_entry: EasyPVConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add sensors for passed config_entry in HA."""
     await setup_platform_entry(
-        hass=hass,
         config_entry=config_entry,
         async_add_entities=async_add_entities,
         create_station_entities=lambda coordinator, station_id: [
             StationPowerSensor(coordinator, station_id),
             StationEnergyTodaySensor(coordinator, station_id),
             StationEnergyTotalSensor(coordinator, station_id),
+            StationLastUpdateSensor(coordinator, station_id),
         ],
         create_device_entities=lambda coordinator, station_id, device_id: [
             DevicePowerSensor(coordinator, station_id, device_id),
             DeviceEnergyTodaySensor(coordinator, station_id, device_id),
             DeviceEnergyMonthSensor(coordinator, station_id, device_id),
             DeviceGridVoltageSensor(coordinator, station_id, device_id),
+            DevicePanelImbalanceSensor(coordinator, station_id, device_id),
+            DeviceLastUpdateSensor(coordinator, station_id, device_id),
+            DeviceBreakerStateSensor(coordinator, station_id, device_id),
         ],
         create_panel_entities=lambda coordinator, station_id, device_id, panel_number: [
             PanelPowerSensor(
@@ -64,7 +88,131 @@ async def async_setup_entry(
     )
 
 
-class StationPowerSensor(EasyPVStationEntity, SensorEntity):  # type: ignore[misc]
+@dataclass(frozen=True, slots=True)
+class Deadband:
+    """Range around the last written value in which changes are not written."""
+
+    absolute: float = 0.0
+    relative: float = 0.0
+    heartbeat: float = DEFAULT_DEADBAND_HEARTBEAT
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any], sensor_type: str) -> "Deadband":
+        """Create the deadband of a sensor type from the config entry options."""
+        return cls(
+            absolute=options.get(f"{sensor_type}_{CONF_DEADBAND}", 0.0),
+            relative=options.get(f"{sensor_type}_{CONF_DEADBAND_RELATIVE}", 0.0) / 100,
+            heartbeat=options.get(CONF_DEADBAND_HEARTBEAT, DEFAULT_DEADBAND_HEARTBEAT),
+        )
+
+    def exceeded(self, last: float, value: float) -> bool:
+        """Check if a value differs significantly from the last value."""
+        return abs(value - last) > max(self.absolute, self.relative * abs(last))
+
+
+class EasyPVDeadbandSensor(EasyPVEntity[Any], SensorEntity):  # type: ignore[misc]
+    """
+    Sensor that only writes significant changes of its value.
+
+    Changes within the deadband of the sensor type are held back until the
+    heartbeat has expired since the last write. A held back value is written
+    by a timer once the heartbeat expires, even if no further update arrives.
+    """
+
+    _last_written: float = 0.0
+    _unsub_heartbeat: CALLBACK_TYPE | None = None
+
+    @cached_property
+    def _deadband(self) -> Deadband:
+        return Deadband.from_options(
+            self.coordinator.config_entry.options, self._attr_translation_key or ""
+        )
+
+    def _state_key(self) -> object:
+        return (self.available, self.native_value)
+
+    def _state_changed(self) -> bool:
+        last = self._last_state
+        value = self.native_value
+        if (
+            isinstance(last, tuple)
+            and last[0] == self.available
+            and isinstance(value, float | int)
+            and isinstance(last[1], float | int)
+            and monotonic() - self._last_written < self._deadband.heartbeat
+            and not self._deadband.exceeded(last[1], value)
+        ):
+            self._schedule_heartbeat()
+            return False
+
+        if not super()._state_changed():
+            return False
+
+        self._last_written = monotonic()
+        self._cancel_heartbeat()
+        return True
+
+    def _schedule_heartbeat(self) -> None:
+        """Write the held back value once the heartbeat has expired."""
+        if self._unsub_heartbeat is None:
+            self._unsub_heartbeat = async_call_later(
+                self.hass,
+                max(0.0, self._last_written + self._deadband.heartbeat - monotonic()),
+                self._async_write_held_back,
+            )
+
+    def _cancel_heartbeat(self) -> None:
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    @callback
+    def _async_write_held_back(self, _: datetime) -> None:
+        self._unsub_heartbeat = None
+        if self._state_changed():
+            self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the heartbeat of a held back value."""
+        self._cancel_heartbeat()
+        await super().async_will_remove_from_hass()
+
+
+class EasyPVDiagnosticSensor(EasyPVEntity[Any], SensorEntity):  # type: ignore[misc]
+    """
+    Sensor reporting how the data of a station or device is refreshed.
+
+    Its value changes without the data changing, so it listens to all updates.
+    It stays available while the data is stale, so the problem can be seen.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: EasyPVCoordinator, key: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, key)
+        self.coordinator_context = None
+
+    @property
+    def available(self) -> bool:  # type: ignore[override]
+        """Return True if the data of this entity is known."""
+        return self.coordinator.is_logged_in and self._data is not None
+
+
+class EasyPVLastUpdateSensor(EasyPVDiagnosticSensor):
+    """Diagnostic sensor with the time the data was last refreshed."""
+
+    device_class = SensorDeviceClass.TIMESTAMP  # type: ignore[override]
+    _attr_translation_key = "last_update"
+
+    @property
+    def native_value(self) -> datetime | None:  # type: ignore[override]
+        """Return the state of the sensor."""
+        return self.coordinator.last_refreshed(self._key)
+
+
+class StationPowerSensor(EasyPVStationEntity, EasyPVDeadbandSensor):  # type: ignore[misc]
     """Representation of a Sensor."""
 
     device_class = SensorDeviceClass.POWER  # type: ignore[override]
@@ -136,7 +284,20 @@ class StationEnergyTotalSensor(EasyPVStationEntity, SensorEntity):  # type: igno
         return self._data.energy_total if self._data else None
 
 
-class DevicePowerSensor(EasyPVDeviceEntity, SensorEntity):  # type: ignore[misc]
+class StationLastUpdateSensor(EasyPVStationEntity, EasyPVLastUpdateSensor):  # type: ignore[misc]
+    """Representation of a Sensor."""
+
+    def __init__(self, coordinator: EasyPVCoordinator, station_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator,
+            station_id,
+        )
+
+        self._attr_unique_id = f"{self._id}_last_update"
+
+
+class DevicePowerSensor(EasyPVDeviceEntity, EasyPVDeadbandSensor):  # type: ignore[misc]
     """Representation of a Sensor."""
 
     device_class = SensorDeviceClass.POWER  # type: ignore[override]
@@ -163,7 +324,7 @@ class DevicePowerSensor(EasyPVDeviceEntity, SensorEntity):  # type: ignore[misc]
         return self._data.power if self._data else None
 
 
-class DeviceGridVoltageSensor(EasyPVDeviceEntity, SensorEntity):  # type: ignore[misc]
+class DeviceGridVoltageSensor(EasyPVDeviceEntity, EasyPVDeadbandSensor):  # type: ignore[misc]
     """Representation of a Sensor."""
 
     device_class = SensorDeviceClass.VOLTAGE  # type: ignore[override]
@@ -236,7 +397,66 @@ class DeviceEnergyMonthSensor(EasyPVDeviceEntity, SensorEntity):  # type: ignore
         return self._data.energy_today if self._data else None
 
 
-class PanelPowerSensor(EasyPVPanelEntity, SensorEntity):  # type: ignore[misc]
+class DevicePanelImbalanceSensor(EasyPVDeviceEntity, SensorEntity):  # type: ignore[misc]
+    """Representation of a Sensor."""
+
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+    _attr_translation_key = "panel_imbalance"
+    _attr_has_entity_name = True
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, coordinator: EasyPVCoordinator, station_id: str, device_id: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, station_id, device_id)
+
+        self._attr_unique_id = f"{self._id}_panel_imbalance"
+
+    @property
+    def native_value(self) -> float | None:  # type: ignore[override]
+        """Return the state of the sensor."""
+        aggregates = self.coordinator.panel_aggregates(self._key)
+        return aggregates.imbalance if aggregates else None
+
+
+class DeviceLastUpdateSensor(EasyPVDeviceEntity, EasyPVLastUpdateSensor):  # type: ignore[misc]
+    """Representation of a Sensor."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, coordinator: EasyPVCoordinator, station_id: str, device_id: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, station_id, device_id)
+
+        self._attr_unique_id = f"{self._id}_last_update"
+
+
+class DeviceBreakerStateSensor(EasyPVDeviceEntity, EasyPVDiagnosticSensor):  # type: ignore[misc]
+    """Representation of a Sensor."""
+
+    device_class = SensorDeviceClass.ENUM  # type: ignore[override]
+    _attr_translation_key = "breaker_state"
+
+    def __init__(
+        self, coordinator: EasyPVCoordinator, station_id: str, device_id: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, station_id, device_id)
+
+        self._attr_options = [state.value for state in BreakerState]
+        self._attr_unique_id = f"{self._id}_breaker_state"
+
+    @property
+    def native_value(self) -> str:  # type: ignore[override]
+        """Return the state of the sensor."""
+        return self.coordinator.breaker_state(self._key).value
+
+
+class PanelPowerSensor(EasyPVPanelEntity, EasyPVDeadbandSensor):  # type: ignore[misc]
     """Representation of a Sensor."""
 
     device_class = SensorDeviceClass.POWER  # type: ignore[override]
@@ -267,7 +487,7 @@ class PanelPowerSensor(EasyPVPanelEntity, SensorEntity):  # type: ignore[misc]
         return self._data.power if self._data else None
 
 
-class PanelVoltageSensor(EasyPVPanelEntity, SensorEntity):  # type: ignore[misc]
+class PanelVoltageSensor(EasyPVPanelEntity, EasyPVDeadbandSensor):  # type: ignore[misc]
     """Representation of a Sensor."""
 
     device_class = SensorDeviceClass.VOLTAGE  # type: ignore[override]
@@ -298,7 +518,7 @@ class PanelVoltageSensor(EasyPVPanelEntity, SensorEntity):  # type: ignore[misc]
         return self._data.voltage if self._data else None
 
 
-class PanelCurrentSensor(EasyPVPanelEntity, SensorEntity):  # type: ignore[misc]
+class PanelCurrentSensor(EasyPVPanelEntity, EasyPVDeadbandSensor):  # type: ignore[misc]
     """Representation of a Sensor."""
 
     device_class = SensorDeviceClass.CURRENT  # type: ignore[override]
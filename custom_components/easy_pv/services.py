@@ -0,0 +1,68 @@
+"""Actions of the Easy PV integration."""
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .backfill import async_backfill
+from .const import DEFAULT_BACKFILL_MONTHS, DOMAIN
+from .coordinator import EasyPVCoordinator
+
+SERVICE_BACKFILL = "backfill"
+# Defined by homeassistant.const only since 2025.9
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_MONTHS = "months"
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_MONTHS, default=DEFAULT_BACKFILL_MONTHS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=120)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the actions of the integration."""
+    running: set[str] = set()
+
+    async def _async_run(
+        entry_id: str, coordinator: EasyPVCoordinator, months: int
+    ) -> None:
+        try:
+            await async_backfill(hass, coordinator, months)
+        finally:
+            running.discard(entry_id)
+
+    async def _async_backfill(call: ServiceCall) -> None:
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+            and entry_id in (None, entry.entry_id)
+        ]
+        if not entries:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="entry_not_loaded"
+            )
+
+        # Backfills run in the background, a running backfill is not started twice.
+        for entry in entries:
+            if entry.entry_id in running:
+                continue
+
+            running.add(entry.entry_id)
+            entry.async_create_background_task(
+                hass,
+                _async_run(entry.entry_id, entry.runtime_data, call.data[ATTR_MONTHS]),
+                f"{DOMAIN} backfill",
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, _async_backfill, schema=BACKFILL_SCHEMA
+    )
@@ -0,0 +1,120 @@
+"""Persistent topology snapshot for the Easy PV integration."""
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, TypedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .model import PVDevice, PVDeviceInfo, PVPanel, PVStation, PVStationTopology
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class SnapshotData(TypedDict):
+    """Serialized form of a snapshot."""
+
+    topology_updated: str | None
+    topology: dict[str, dict[str, Any]]
+    stations: dict[str, dict[str, Any]]
+
+
+@dataclass
+class Snapshot:
+    """Last known topology and station data of a config entry."""
+
+    topology: dict[str, PVStationTopology]
+    topology_updated: datetime | None
+    stations: dict[str, PVStation]
+
+
+def _panel_from_dict(data: dict[str, Any]) -> PVPanel:
+    return PVPanel(**data)
+
+
+def _device_from_dict(data: dict[str, Any]) -> PVDevice:
+    return PVDevice(
+        **{
+            **data,
+            "info": PVDeviceInfo(**data["info"]),
+            "panels": tuple(_panel_from_dict(panel) for panel in data["panels"]),
+        }
+    )
+
+
+def _station_from_dict(data: dict[str, Any]) -> PVStation:
+    return PVStation(
+        **{
+            **data,
+            "devices": {
+                device_id: _device_from_dict(device)
+                for device_id, device in data["devices"].items()
+            },
+        }
+    )
+
+
+class SnapshotStore:
+    """Stores snapshots in Home Assistant storage."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot store."""
+        self._store = Store[SnapshotData](
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+
+    async def async_load(self) -> Snapshot | None:
+        """Load the last saved snapshot, if any."""
+        data = await self._store.async_load()
+        if data is None:
+            return None
+
+        try:
+            return Snapshot(
+                topology={
+                    station_id: PVStationTopology(
+                        **{**station, "device_ids": tuple(station["device_ids"])}
+                    )
+                    for station_id, station in data["topology"].items()
+                },
+                topology_updated=dt_util.parse_datetime(data["topology_updated"])
+                if data["topology_updated"]
+                else None,
+                stations={
+                    station_id: _station_from_dict(station)
+                    for station_id, station in data["stations"].items()
+                },
+            )
+        except (KeyError, TypeError):
+            LOGGER.warning("Discarding invalid topology snapshot")
+            return None
+
+    def async_schedule_save(self, snapshot: Snapshot) -> None:
+        """Schedule saving a snapshot."""
+        self._store.async_delay_save(
+            lambda: SnapshotData(
+                topology_updated=snapshot.topology_updated.isoformat()
+                if snapshot.topology_updated
+                else None,
+                topology={
+                    station_id: asdict(station)
+                    for station_id, station in snapshot.topology.items()
+                },
+                stations={
+                    station_id: asdict(station)
+                    for station_id, station in snapshot.stations.items()
+                },
+            ),
+            SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
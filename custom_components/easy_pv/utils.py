@@ -7,14 +7,13 @@ managing entities and devices in the Easy PV integration.
 
 from collections.abc import Callable, Iterable
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import EasyPVConfigEntry
-from .const import DOMAIN
 from .coordinator import EasyPVCoordinator
+from .model import TopologyDiff
 
 type CreateStationEntitiesCallback = Callable[
     [EasyPVCoordinator, str], Iterable[Entity]
@@ -27,8 +26,7 @@ type CreatePanelEntitiesCallback = Callable[
 ]
 
 
-async def setup_platform_entry(  # noqa: PLR0913
-    hass: HomeAssistant,
+async def setup_platform_entry(
     config_entry: EasyPVConfigEntry,
     async_add_entities: AddEntitiesCallback,
     create_station_entities: CreateStationEntitiesCallback = lambda _, __: [],
@@ -38,52 +36,26 @@ async def setup_platform_entry(  # noqa: PLR0913
     """Add sensors for passed config_entry in HA."""
     coordinator = config_entry.runtime_data
 
-    known_devices: set[str] = set()
-
-    def _check_device() -> None:
-        current_devices = coordinator.enumerate_devices()
-        new_devices = current_devices - known_devices
-        stale_devices = known_devices - current_devices
-        known_devices.clear()
-        known_devices.update(current_devices)
-
-        if new_devices:
-            new_entities: list[Entity] = []
-            for station in coordinator.data.values():
-                if station.entity_id in new_devices:
-                    new_entities.extend(
-                        create_station_entities(coordinator, station.entity_id)
-                    )
-
-                for device in station.devices.values():
-                    if device.entity_id in new_devices:
-                        new_entities.extend(
-                            create_device_entities(
-                                coordinator, station.entity_id, device.id
-                            )
-                        )
-
-                    for panel in device.panels or []:
-                        if panel.entity_id in new_devices:
-                            new_entities.extend(
-                                create_panel_entities(
-                                    coordinator, station.entity_id, device.id, panel.idx
-                                )
-                            )
+    @callback
+    def _add_entities(diff: TopologyDiff) -> None:
+        new_entities: list[Entity] = []
+        for station in diff.added_stations:
+            new_entities.extend(create_station_entities(coordinator, station.id))
+
+        for device in diff.added_devices:
+            new_entities.extend(
+                create_device_entities(coordinator, device.station_id, device.id)
+            )
+
+        for panel in diff.added_panels:
+            new_entities.extend(
+                create_panel_entities(
+                    coordinator, panel.station_id, panel.device_id, panel.idx
+                )
+            )
 
+        if new_entities:
             async_add_entities(new_entities)
 
-        if stale_devices:
-            device_registry = dr.async_get(hass)
-            for device_id in stale_devices:
-                device = device_registry.async_get_device(
-                    identifiers={(DOMAIN, device_id)}
-                )
-                if device:
-                    device_registry.async_update_device(
-                        device_id=device.id,
-                        remove_config_entry_id=config_entry.entry_id,
-                    )
-
-    _check_device()
-    config_entry.async_on_unload(coordinator.async_add_listener(_check_device))
+    _add_entities(coordinator.current_topology())
+    config_entry.async_on_unload(coordinator.async_add_topology_listener(_add_entities))